@@ -191,6 +191,11 @@ class GrangerCausalityAnalyzer:
             
             # Store the results
             self.analyses[analysis_key] = results
+
+        # Groupings and pairwise values memoized on the analyzer by the services
+        # describe the old analyses (see services.data_loader_service.ANALYZER_CACHES)
+        for cache in ('_grouping_cache', '_pairwise_cache', '_pairs_cache'):
+            self.__dict__.pop(cache, None)
     
     def analyze_pairwise_connectivity(self, df):
         """
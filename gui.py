@@ -13,6 +13,7 @@ from visualize_nodal import plot_nodal_metrics
 from visualize_pairwise import plot_pairwise_comparison
 from visualize_global import plot_global_metrics
 import report_generator
+from services import clear_grouping_cache
 import scipy.stats as stats
 from statsmodels.formula.api import ols
 from statsmodels.stats.anova import anova_lm
@@ -1944,6 +1945,9 @@ class GrangerAnalysisGUI:
                             self.analyzer.analyses[key]['pairwise']['directional_pairs'][pair] = mean_value
                             removed_count += 1
         
+        # Values memoized on the analyzer by the services predate the replacement
+        clear_grouping_cache(self.analyzer)
+        
         # Refresh the outlier detection display
         self._detect_outliers()
         
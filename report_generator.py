@@ -1,11 +1,48 @@
 import os
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
-from reportlab.lib.units import inch
-import pandas as pd
-import numpy as np
+import sys
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def _metrics_df(metrics_by_key, columns):
+    """
+    Convert a {key: {metric: value}} dict into a DataFrame with one row per key
+    
+    Args:
+        metrics_by_key (dict): Per-electrode (or per-pair) metric dictionaries
+        columns (list): Metrics the table reads, so an empty dict still gives
+            a DataFrame with those (empty) columns
+    
+    Returns:
+        pandas.DataFrame: Metrics as columns, indexed by the original keys
+    """
+    import pandas as pd
+    if not metrics_by_key:
+        return pd.DataFrame(columns=columns)
+    return pd.DataFrame.from_dict(metrics_by_key, orient='index')
+
+
+def _is_valid_png(path):
+    """
+    Cheaply check that path is a PNG file by reading its 8-byte signature
+    
+    Missing, empty or non-PNG figure files are rejected here instead of failing
+    deep inside ReportLab/PIL while the document is being built.
+    """
+    try:
+        with open(path, 'rb') as f:
+            return f.read(8) == _PNG_SIGNATURE
+    except OSError:
+        return False
+
+
+def _format_columns(df, columns):
+    """Format the given numeric columns of df as fixed 6-decimal strings"""
+    # astype(object) keeps the columns string-typed even when df is empty, so
+    # they can still be concatenated with '±'
+    return {col: df[col].astype(float).map('{:.6f}'.format).astype(object, copy=False)
+            for col in columns}
+
 
 def generate_report(analysis, output_path, figures_dir, base_name):
     """
@@ -17,6 +54,14 @@ def generate_report(analysis, output_path, figures_dir, base_name):
         figures_dir (str): Directory containing figures
         base_name (str): Base name for figure files
     """
+    # ReportLab is imported here rather than at module load so that importing
+    # this module stays cheap when no report is generated
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
+    from reportlab.lib.units import inch
+
     # Initialize the document
     doc = SimpleDocTemplate(output_path, pagesize=letter)
     styles = getSampleStyleSheet()
@@ -72,7 +117,7 @@ def generate_report(analysis, output_path, figures_dir, base_name):
     
     # Add matrix figure
     matrix_img_path = os.path.join(figures_dir, f"{base_name}_matrix.png")
-    if os.path.exists(matrix_img_path):
+    if _is_valid_png(matrix_img_path):
         img = Image(matrix_img_path, width=6*inch, height=5*inch)
         elements.append(img)
     
@@ -90,7 +135,7 @@ def generate_report(analysis, output_path, figures_dir, base_name):
     
     # Add network figure
     network_img_path = os.path.join(figures_dir, f"{base_name}_network.png")
-    if os.path.exists(network_img_path):
+    if _is_valid_png(network_img_path):
         img = Image(network_img_path, width=6*inch, height=5*inch)
         elements.append(img)
     
@@ -119,19 +164,20 @@ def generate_report(analysis, output_path, figures_dir, base_name):
     nodal_data.append(['Electrode', 'In-Strength', 'Out-Strength', 'Causal Flow', 'Category'])
     
     # Sort electrodes by causal flow
-    sorted_electrodes = sorted(analysis['nodal'].keys(), 
-                              key=lambda e: analysis['nodal'][e]['causal_flow'],
-                              reverse=True)
-    
-    for electrode in sorted_electrodes:
-        metrics = analysis['nodal'][electrode]
-        nodal_data.append([
-            electrode,
-            f"{metrics['in_strength']:.6f}",
-            f"{metrics['out_strength']:.6f}",
-            f"{metrics['causal_flow']:.6f}",
-            metrics['category']
-        ])
+    nodal_df = _metrics_df(analysis['nodal'], [
+        'in_strength', 'out_strength', 'causal_flow', 'category',
+    ]).sort_values(
+        'causal_flow', ascending=False, kind='stable')
+    formatted = _format_columns(nodal_df, ['in_strength', 'out_strength', 'causal_flow'])
+    
+    # Electrode labels and categories repeat across every table; intern them so
+    # each cell shares one string object
+    for electrode, in_s, out_s, flow, category in zip(nodal_df.index,
+                                                       formatted['in_strength'],
+                                                       formatted['out_strength'],
+                                                       formatted['causal_flow'],
+                                                       nodal_df['category']):
+        nodal_data.append([sys.intern(str(electrode)), in_s, out_s, flow, sys.intern(category)])
     
     table = Table(nodal_data, colWidths=[0.8*inch, 1.2*inch, 1.2*inch, 1.2*inch, 1*inch])
     table.setStyle(TableStyle([
@@ -149,7 +195,7 @@ def generate_report(analysis, output_path, figures_dir, base_name):
     
     # Add nodal figure
     nodal_img_path = os.path.join(figures_dir, f"{base_name}_nodal.png")
-    if os.path.exists(nodal_img_path):
+    if _is_valid_png(nodal_img_path):
         img = Image(nodal_img_path, width=6*inch, height=6*inch)
         elements.append(img)
     
@@ -167,7 +213,7 @@ def generate_report(analysis, output_path, figures_dir, base_name):
     
     # Add pairwise figure
     pairwise_img_path = os.path.join(figures_dir, f"{base_name}_pairwise.png")
-    if os.path.exists(pairwise_img_path):
+    if _is_valid_png(pairwise_img_path):
         img = Image(pairwise_img_path, width=6*inch, height=4*inch)
         elements.append(img)
     
@@ -203,7 +249,7 @@ def generate_report(analysis, output_path, figures_dir, base_name):
     ]
     
     for metric, value in metrics_to_display:
-        global_data.append([metric, f"{value:.6f}"])
+        global_data.append([metric, f"{float(value):.6f}"])
     
     table = Table(global_data, colWidths=[3*inch, 1.5*inch])
     table.setStyle(TableStyle([
@@ -221,7 +267,7 @@ def generate_report(analysis, output_path, figures_dir, base_name):
     
     # Add global metrics figure
     global_img_path = os.path.join(figures_dir, f"{base_name}_global.png")
-    if os.path.exists(global_img_path):
+    if _is_valid_png(global_img_path):
         img = Image(global_img_path, width=6*inch, height=3*inch)
         elements.append(img)
     
@@ -253,6 +299,12 @@ def generate_group_report(group_stats, output_path, figures_dir, group_name):
         figures_dir (str): Directory containing figures
         group_name (str): Name for the group report
     """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib.units import inch
+
     # Initialize the document
     doc = SimpleDocTemplate(output_path, pagesize=letter)
     styles = getSampleStyleSheet()
@@ -310,19 +362,25 @@ def generate_group_report(group_stats, output_path, figures_dir, group_name):
                      'Causal Flow (Mean±SD)', 'Dominant Category'])
     
     # Sort electrodes by mean causal flow
-    sorted_electrodes = sorted(group_stats['nodal'].keys(), 
-                              key=lambda e: group_stats['nodal'][e]['causal_flow_mean'],
-                              reverse=True)
-    
-    for electrode in sorted_electrodes:
-        metrics = group_stats['nodal'][electrode]
-        nodal_data.append([
-            electrode,
-            f"{metrics['in_strength_mean']:.6f}±{metrics['in_strength_std']:.6f}",
-            f"{metrics['out_strength_mean']:.6f}±{metrics['out_strength_std']:.6f}",
-            f"{metrics['causal_flow_mean']:.6f}±{metrics['causal_flow_std']:.6f}",
-            metrics['dominant_category']
-        ])
+    nodal_df = _metrics_df(group_stats['nodal'], [
+        'in_strength_mean', 'in_strength_std',
+        'out_strength_mean', 'out_strength_std',
+        'causal_flow_mean', 'causal_flow_std', 'dominant_category',
+    ]).sort_values(
+        'causal_flow_mean', ascending=False, kind='stable')
+    formatted = _format_columns(nodal_df, [
+        'in_strength_mean', 'in_strength_std',
+        'out_strength_mean', 'out_strength_std',
+        'causal_flow_mean', 'causal_flow_std',
+    ])
+    
+    in_col = formatted['in_strength_mean'] + '±' + formatted['in_strength_std']
+    out_col = formatted['out_strength_mean'] + '±' + formatted['out_strength_std']
+    flow_col = formatted['causal_flow_mean'] + '±' + formatted['causal_flow_std']
+    
+    for electrode, in_s, out_s, flow, category in zip(nodal_df.index, in_col, out_col, flow_col,
+                                                       nodal_df['dominant_category']):
+        nodal_data.append([sys.intern(str(electrode)), in_s, out_s, flow, sys.intern(category)])
     
     table = Table(nodal_data, colWidths=[0.7*inch, 1.5*inch, 1.5*inch, 1.5*inch, 1*inch])
     table.setStyle(TableStyle([
@@ -352,18 +410,12 @@ def generate_group_report(group_stats, output_path, figures_dir, group_name):
     pairwise_data.append(['Connection', 'Mean GC Value', 'Standard Deviation'])
     
     # Sort pairs by mean value and take top 10
-    sorted_pairs = sorted(group_stats['pairwise'].keys(), 
-                         key=lambda p: group_stats['pairwise'][p]['mean'],
-                         reverse=True)
-    top_pairs = sorted_pairs[:10]  # Show only top 10 pairs
-    
-    for pair in top_pairs:
-        metrics = group_stats['pairwise'][pair]
-        pairwise_data.append([
-            pair,
-            f"{metrics['mean']:.6f}",
-            f"{metrics['std']:.6f}"
-        ])
+    top_pairs_df = _metrics_df(group_stats['pairwise'], ['mean', 'std']).sort_values(
+        'mean', ascending=False, kind='stable').head(10)  # Show only top 10 pairs
+    formatted = _format_columns(top_pairs_df, ['mean', 'std'])
+    
+    for row in zip(top_pairs_df.index, formatted['mean'], formatted['std']):
+        pairwise_data.append(list(row))
     
     table = Table(pairwise_data, colWidths=[2*inch, 1.5*inch, 1.5*inch])
     table.setStyle(TableStyle([
@@ -412,10 +464,10 @@ def generate_group_report(group_stats, output_path, figures_dir, group_name):
             metric = group_stats['global'][metric_key]
             global_data.append([
                 metric_names.get(metric_key, metric_key),
-                f"{metric['mean']:.6f}",
-                f"{metric['std']:.6f}",
-                f"{metric['min']:.6f}",
-                f"{metric['max']:.6f}"
+                f"{float(metric['mean']):.6f}",
+                f"{float(metric['std']):.6f}",
+                f"{float(metric['min']):.6f}",
+                f"{float(metric['max']):.6f}"
             ])
     
     table = Table(global_data, colWidths=[2*inch, 1*inch, 1*inch, 0.8*inch, 0.8*inch])
@@ -3,136 +3,85 @@
 Services Package for Granger Causality Analysis
 
 This package contains modular services for data loading, visualization, and reporting.
-"""
-
-# Import main service functions for easy access
-from .data_loader_service import (
-    load_and_analyze_files,
-    group_analyses_by_participant,
-    group_analyses_by_condition,
-)
-
-from .matrix_visualization_service import (
-    generate_individual_matrix_visualizations,
-    generate_condition_level_matrix_visualizations,
-)
-
-from .network_visualization_service import (
-    generate_individual_network_visualizations,
-    generate_condition_level_network_visualizations,
-)
-
-from .nodal_visualization_service import (
-    generate_individual_nodal_visualizations,
-    generate_condition_level_nodal_visualizations,
-)
-
-from .pairwise_visualization_service import (
-    generate_individual_pairwise_visualizations,
-    generate_condition_level_pairwise_visualizations,
-)
-
-from .global_visualization_service import (
-    generate_individual_global_visualizations,
-    generate_condition_level_global_visualizations,
-)
-
-from .report_service import (
-    generate_matrix_analysis_report,
-    generate_network_analysis_report,
-    generate_nodal_analysis_report,
-    generate_pairwise_analysis_report,
-    generate_global_analysis_report,
-)
-
-from .file_system_service import (
-    create_matrix_output_directories,
-    create_network_output_directories,
-    create_nodal_output_directories,
-    create_pairwise_output_directories,
-    create_global_output_directories,
-    validate_input_directory,
-)
-
-# New database and caching services
-from .database_service import (
-    DatabaseService,
-    get_database_service,
-    init_database,
-)
 
-from .cached_data_loader_service import (
-    CachedDataLoaderService,
-    get_cached_data_loader,
-    load_files_with_cache,
-)
-
-# GUI integration service
-from .gui_integration_service import (
-    GUIIntegrationService,
-    get_gui_service,
-    populate_gui_from_cache,
-)
-
-# Statistics services
-from .statistics_service import (
-    StatisticsService,
-    get_statistics_service,
-)
+Service functions are re-exported lazily (PEP 562): a sub-service module is only
+imported the first time one of its names is accessed, so importing the package
+does not pull in every visualization/statistics dependency up front.
+"""
 
-from .statistics_gui_service import (
-    StatisticsGUIService,
-    get_statistics_gui_service,
-)
+import importlib
 
-__all__ = [
+# Map each exported name to the sub-service module that defines it
+_EXPORTS = {
     # Data loading
-    "load_and_analyze_files",
-    "group_analyses_by_participant",
-    "group_analyses_by_condition",
+    "load_and_analyze_files": ".data_loader_service",
+    "group_analyses_by_participant": ".data_loader_service",
+    "group_analyses_by_condition": ".data_loader_service",
+    "clear_grouping_cache": ".data_loader_service",
     # Matrix visualization
-    "generate_individual_matrix_visualizations",
-    "generate_condition_level_matrix_visualizations",
+    "generate_individual_matrix_visualizations": ".matrix_visualization_service",
+    "generate_condition_level_matrix_visualizations": ".matrix_visualization_service",
     # Network visualization
-    "generate_individual_network_visualizations",
-    "generate_condition_level_network_visualizations",
+    "generate_individual_network_visualizations": ".network_visualization_service",
+    "generate_condition_level_network_visualizations": ".network_visualization_service",
     # Nodal visualization
-    "generate_individual_nodal_visualizations",
-    "generate_condition_level_nodal_visualizations",
+    "generate_individual_nodal_visualizations": ".nodal_visualization_service",
+    "generate_condition_level_nodal_visualizations": ".nodal_visualization_service",
     # Pairwise visualization
-    "generate_individual_pairwise_visualizations",
-    "generate_condition_level_pairwise_visualizations",
+    "generate_individual_pairwise_visualizations": ".pairwise_visualization_service",
+    "generate_condition_level_pairwise_visualizations": ".pairwise_visualization_service",
     # Global visualization
-    "generate_individual_global_visualizations",
-    "generate_condition_level_global_visualizations",
+    "generate_individual_global_visualizations": ".global_visualization_service",
+    "generate_condition_level_global_visualizations": ".global_visualization_service",
     # Report generation
-    "generate_matrix_analysis_report",
-    "generate_network_analysis_report",
-    "generate_nodal_analysis_report",
-    "generate_pairwise_analysis_report",
-    "generate_global_analysis_report",
+    "generate_matrix_analysis_report": ".report_service",
+    "generate_network_analysis_report": ".report_service",
+    "generate_nodal_analysis_report": ".report_service",
+    "generate_pairwise_analysis_report": ".report_service",
+    "generate_global_analysis_report": ".report_service",
     # File system operations
-    "create_matrix_output_directories",
-    "create_network_output_directories",
-    "create_nodal_output_directories",
-    "create_pairwise_output_directories",
-    "create_global_output_directories",
-    "validate_input_directory",
+    "create_output_directories": ".file_system_service",
+    "create_matrix_output_directories": ".file_system_service",
+    "create_network_output_directories": ".file_system_service",
+    "create_nodal_output_directories": ".file_system_service",
+    "create_pairwise_output_directories": ".file_system_service",
+    "create_global_output_directories": ".file_system_service",
+    "validate_input_directory": ".file_system_service",
+    "copy_output_file": ".file_system_service",
+    "write_matrix_csv": ".file_system_service",
     # Database services
-    "DatabaseService",
-    "get_database_service",
-    "init_database",
+    "DatabaseService": ".database_service",
+    "get_database_service": ".database_service",
+    "init_database": ".database_service",
     # Cached data loading
-    "CachedDataLoaderService",
-    "get_cached_data_loader",
-    "load_files_with_cache",
+    "CachedDataLoaderService": ".cached_data_loader_service",
+    "get_cached_data_loader": ".cached_data_loader_service",
+    "load_files_with_cache": ".cached_data_loader_service",
     # GUI integration
-    "GUIIntegrationService",
-    "get_gui_service",
-    "populate_gui_from_cache",
+    "GUIIntegrationService": ".gui_integration_service",
+    "get_gui_service": ".gui_integration_service",
+    "populate_gui_from_cache": ".gui_integration_service",
     # Statistics services
-    "StatisticsService",
-    "get_statistics_service",
-    "StatisticsGUIService",
-    "get_statistics_gui_service",
-]
+    "StatisticsService": ".statistics_service",
+    "get_statistics_service": ".statistics_service",
+    "StatisticsGUIService": ".statistics_gui_service",
+    "get_statistics_gui_service": ".statistics_gui_service",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Import the sub-service that defines ``name`` on first access"""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache on the package so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
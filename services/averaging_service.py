@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Averaging Service
+
+This module averages connectivity matrices over the electrodes they have in
+common, for the condition-level visualizations.
+"""
+
+import numpy as np
+
+
+def _positions(labels, common_index):
+    """Return the positions of the common electrodes in an axis of a matrix
+
+    Raises:
+        KeyError: If the axis lacks any of the electrodes
+    """
+    positions = labels.get_indexer(common_index)
+    if (positions < 0).any():
+        missing = common_index[positions < 0].tolist()
+        raise KeyError(f"Electrodes missing from matrix: {missing}")
+    return positions
+
+
+def average_matrices(matrices, common_index):
+    """
+    Average connectivity matrices over a common set of electrodes
+
+    Each matrix is gathered by position (unless it is already in common
+    order) and added in place.
+
+    Args:
+        matrices (list): Connectivity matrices (pandas.DataFrame)
+        common_index (pandas.Index): Electrodes present in every matrix, in
+            output order
+
+    Returns:
+        numpy.ndarray: Averaged (n, n) matrix
+
+    Raises:
+        KeyError: If a matrix lacks a common electrode in its rows or columns
+    """
+    averaged_values = np.zeros((len(common_index), len(common_index)))
+    for matrix in matrices:
+        values = matrix.values
+        if not (
+            matrix.index.equals(common_index) and matrix.columns.equals(common_index)
+        ):
+            # Extract only common electrodes by position
+            rows = _positions(matrix.index, common_index)
+            cols = _positions(matrix.columns, common_index)
+            values = values[np.ix_(rows, cols)]
+        np.add(averaged_values, values, out=averaged_values)
+
+    # Divide by number of matrices to get average
+    averaged_values /= len(matrices)
+    return averaged_values
@@ -6,61 +6,196 @@ This service enhances the data loader with database caching to prevent
 redundant file processing and speed up repeated operations.
 """
 
+import logging
 import os
-import traceback
-from typing import Dict, List, Tuple, Optional
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Dict, List, Set, Tuple, Optional
 from granger_analysis import GrangerCausalityAnalyzer
-from .data_loader_service import extract_metadata_from_filename, find_input_files
+from .data_loader_service import (
+    clear_grouping_cache,
+    extract_metadata_from_filename,
+    find_input_files,
+)
 from .database_service import DatabaseService
 
+logger = logging.getLogger(__name__)
+
+# Maximum number of entries kept in the in-process metadata cache
+METADATA_CACHE_SIZE = 4096
+
+
+def _configure_logging():
+    """
+    Send the services' log records to stdout unless logging is configured
+
+    The handler goes on the package logger so the database service's records
+    are written too. Per-file progress is logged at DEBUG and summaries at
+    INFO, so by default only the summaries are written.
+    """
+    package_logger = logging.getLogger(__name__.rpartition(".")[0] or __name__)
+    if package_logger.handlers or logging.getLogger().handlers:
+        return
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    package_logger.addHandler(handler)
+    if package_logger.level == logging.NOTSET:
+        package_logger.setLevel(logging.INFO)
+
+
+class LoadResult(Enum):
+    """Outcome of loading a single file; truthy unless the load failed"""
+
+    CACHE = 1  # analysis restored from the database
+    FRESH = 2  # data loaded from the file and still to be analyzed
+    FAIL = 3
+
+    def __bool__(self):
+        return self is not LoadResult.FAIL
+
+
+def _analysis_key(metadata: Dict) -> str:
+    """Analysis key used by granger_analysis.py: participant_timepoint_condition"""
+    return (
+        f"{metadata['participant_id']}_{metadata['timepoint']}_{metadata['condition']}"
+    )
+
+
+def _merge_analyzer(target: GrangerCausalityAnalyzer, source: GrangerCausalityAnalyzer):
+    """Merge the data loaded into ``source`` into ``target``"""
+    target.analyses.update(source.analyses)
+    clear_grouping_cache(target)
+    target.processed_data.update(source.processed_data)
+    target.data_files.extend(source.data_files)
+
+    for attr in ("participant_ids", "timepoints", "conditions"):
+        values = getattr(target, attr)
+        for value in getattr(source, attr):
+            if value not in values:
+                values.append(value)
+
 
 class CachedDataLoaderService:
     """Enhanced data loader with database caching capabilities"""
 
-    def __init__(self, db_path: str = "granger_cache.db"):
+    def __init__(self, db_path: str = "granger_cache.db", durability: str = "safe"):
         """
         Initialize the cached data loader service
 
         Args:
             db_path (str): Path to the SQLite database file
+            durability (str): Durability level of the database, see
+                DatabaseService
         """
-        self.db_service = DatabaseService(db_path)
+        # Every entry point (the CLI loader and the GUI integration service)
+        # goes through this constructor, so the summaries are written for all
+        _configure_logging()
+
+        self.db_service = DatabaseService(db_path, durability)
+        # LRU of metadata already resolved in this process, keyed by absolute path
+        self._meta_cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._meta_lock = threading.Lock()
+        # Analysis key of every file loaded from disk, keyed by absolute path
+        self._path_to_key: Dict[str, str] = {}
+
+    def _remember_metadata(self, file_path: str, metadata: Dict) -> Dict:
+        """Store metadata in the in-process LRU and return a copy of it"""
+        with self._meta_lock:
+            self._meta_cache[file_path] = dict(metadata)
+            self._meta_cache.move_to_end(file_path)
+            if len(self._meta_cache) > METADATA_CACHE_SIZE:
+                self._meta_cache.popitem(last=False)
+        return metadata
 
-    def get_file_metadata_with_cache(self, file_path: str) -> Dict:
+    def get_file_metadata_with_cache(
+        self, file_path: str, filename: Optional[str] = None
+    ) -> Dict:
         """
         Get file metadata, using cache if available or extracting if not
 
         Args:
             file_path (str): Path to the file
+            filename (str, optional): Basename of file_path, if already known
 
         Returns:
             dict: File metadata
         """
+        if filename is None:
+            filename = os.path.basename(file_path)
+
+        # Metadata already resolved in this process needs no database query
+        cache_key = os.path.abspath(file_path)
+        with self._meta_lock:
+            if cache_key in self._meta_cache:
+                self._meta_cache.move_to_end(cache_key)
+                return dict(self._meta_cache[cache_key])
+
         # First try to get from cache
         cached_metadata = self.db_service.get_file_metadata(file_path)
 
         if cached_metadata:
-            print(f"  Using cached metadata for: {os.path.basename(file_path)}")
-            return cached_metadata
+            logger.debug("  Using cached metadata for: %s", filename)
+            return self._remember_metadata(cache_key, cached_metadata)
 
         # Extract metadata and cache it
-        filename = os.path.basename(file_path)
         metadata = extract_metadata_from_filename(filename)
 
         try:
             self.db_service.register_file(file_path, metadata)
-            print(f"  Extracted and cached metadata for: {filename}")
+            logger.debug("  Extracted and cached metadata for: %s", filename)
         except Exception as e:
-            print(f"  Warning: Could not cache metadata for {filename}: {e}")
+            logger.warning(
+                "  Warning: Could not cache metadata for %s: %s", filename, e
+            )
 
-        return metadata
+        return self._remember_metadata(cache_key, metadata)
+
+    def _register_unknown_files(self, file_paths: List[str]) -> Dict[str, Dict]:
+        """
+        Get metadata for many files, registering the unknown ones in bulk
+
+        Args:
+            file_paths (list): Paths of the files
+
+        Returns:
+            dict: Mapping of absolute file path to metadata
+        """
+        # Fetch metadata for all known files in one batched query
+        metadata_by_path = self.db_service.get_files_metadata(file_paths)
+
+        # Extract metadata for the rest and register them with one bulk insert
+        new_items = []
+        for file_path in file_paths:
+            abs_path = os.path.abspath(file_path)
+            if abs_path not in metadata_by_path:
+                metadata = extract_metadata_from_filename(file_path)
+                metadata_by_path[abs_path] = metadata
+                new_items.append((file_path, metadata))
+
+        if new_items:
+            try:
+                self.db_service.register_files_bulk(new_items)
+            except Exception as e:
+                logger.warning(
+                    "  Warning: Could not cache metadata for new files: %s", e
+                )
+
+        for abs_path, metadata in metadata_by_path.items():
+            self._remember_metadata(abs_path, metadata)
+
+        return metadata_by_path
 
     def load_single_file_with_cache(
         self,
         analyzer: GrangerCausalityAnalyzer,
         file_path: str,
         force_reload: bool = False,
-    ) -> bool:
+        cached_paths: Optional[Set[str]] = None,
+    ) -> LoadResult:
         """
         Load a single file with caching support
 
@@ -68,24 +203,35 @@ class CachedDataLoaderService:
             analyzer: GrangerCausalityAnalyzer instance
             file_path (str): Path to the file to load
             force_reload (bool): Force reload even if cached
+            cached_paths (set, optional): Absolute paths known to be cached, as
+                returned by DatabaseService.get_cached_paths. When given, it is
+                used instead of querying the database for this file.
 
         Returns:
-            bool: True if loaded successfully
+            LoadResult: CACHE or FRESH if loaded successfully, FAIL otherwise
         """
         filename = os.path.basename(file_path)
 
+        if force_reload:
+            is_cached = False
+        elif cached_paths is not None:
+            is_cached = os.path.abspath(file_path) in cached_paths
+        else:
+            is_cached = self.db_service.is_file_cached(file_path)
+
         # Check if we have cached results and file hasn't changed
-        if not force_reload and self.db_service.is_file_cached(file_path):
-            print(f"  Loading cached analysis for: {filename}")
+        if is_cached:
+            logger.debug("  Loading cached analysis for: %s", filename)
 
             try:
-                # Get cached analysis
-                cached_result = self.db_service.get_cached_analysis(
+                # Get cached analysis and metadata in one query
+                cached_result = self.db_service.get_cached_bundle(
                     file_path, "granger_causality"
                 )
                 if cached_result:
-                    # Get metadata
-                    metadata = self.get_file_metadata_with_cache(file_path)
+                    metadata = self._remember_metadata(
+                        os.path.abspath(file_path), cached_result["metadata"]
+                    )
 
                     # Create analysis key
                     analysis_key = f"{metadata['participant_id']}_{metadata['condition']}_{metadata['timepoint']}"
@@ -97,31 +243,88 @@ class CachedDataLoaderService:
                         "global": cached_result["global_metrics"],
                         "electrode_list": cached_result["electrode_list"],
                     }
+                    clear_grouping_cache(analyzer)
 
-                    print(f"  ✓ Loaded from cache: {filename}")
-                    return True
+                    logger.debug("  ✓ Loaded from cache: %s", filename)
+                    return LoadResult.CACHE
             except Exception as e:
-                print(f"  Warning: Failed to load cached result for {filename}: {e}")
+                logger.warning(
+                    "  Warning: Failed to load cached result for %s: %s", filename, e
+                )
                 # Fall through to normal loading
 
         # Load file normally and cache the result
         try:
             # Get metadata
-            metadata = self.get_file_metadata_with_cache(file_path)
+            metadata = self.get_file_metadata_with_cache(file_path, filename=filename)
 
             # Load data with metadata
             analyzer.load_data_with_metadata(file_path, metadata)
+            self._path_to_key[os.path.abspath(file_path)] = _analysis_key(metadata)
 
-            print(f"  ✓ Loaded and will cache: {filename}")
-            return True
+            logger.debug("  ✓ Loaded and will cache: %s", filename)
+            return LoadResult.FRESH
 
         except Exception as e:
-            print(f"  ✗ Failed to load: {filename}: {str(e)}")
-            traceback.print_exc()
-            return False
+            # Every caller sees the failure; the traceback is only formatted
+            # when debug output is enabled
+            logger.warning(
+                "  ✗ Failed to load: %s: %s",
+                filename,
+                e,
+                exc_info=logger.isEnabledFor(logging.DEBUG),
+            )
+            return LoadResult.FAIL
+
+    def load_files_parallel(
+        self,
+        analyzer: GrangerCausalityAnalyzer,
+        file_paths: List[str],
+        force_reload: bool = False,
+        cached_paths: Optional[Set[str]] = None,
+        max_workers: Optional[int] = None,
+    ) -> List[LoadResult]:
+        """
+        Load several files with caching support using a thread pool
+
+        Reading Excel files is I/O bound, so files are loaded concurrently.
+        Each worker loads into its own scratch analyzer; the results are then
+        merged into ``analyzer`` in the order of ``file_paths``, so the outcome
+        is the same as loading the files one after another.
+
+        Args:
+            analyzer: GrangerCausalityAnalyzer instance to load into
+            file_paths (list): Paths of the files to load
+            force_reload (bool): Force reload even if cached
+            cached_paths (set, optional): Absolute paths known to be cached
+            max_workers (int, optional): Number of worker threads
+                (default: os.cpu_count())
+
+        Returns:
+            list: One LoadResult per file
+        """
+
+        def load_one(file_path):
+            scratch = GrangerCausalityAnalyzer()
+            loaded = self.load_single_file_with_cache(
+                scratch, file_path, force_reload, cached_paths
+            )
+            return loaded, scratch
+
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            outcomes = list(executor.map(load_one, file_paths))
+
+        for loaded, scratch in outcomes:
+            if loaded:
+                _merge_analyzer(analyzer, scratch)
+
+        return [loaded for loaded, _ in outcomes]
 
     def cache_analysis_results(
-        self, analyzer: GrangerCausalityAnalyzer, file_paths: List[str]
+        self,
+        analyzer: GrangerCausalityAnalyzer,
+        file_paths: List[str],
+        path_to_key: Optional[Dict[str, str]] = None,
     ):
         """
         Cache analysis results for loaded files
@@ -129,57 +332,82 @@ class CachedDataLoaderService:
         Args:
             analyzer: GrangerCausalityAnalyzer instance with completed analyses
             file_paths: List of file paths that were analyzed
+            path_to_key (dict, optional): Analysis key of each file path, as
+                collected while loading. When given, the files' metadata is not
+                looked up again; the files must already be registered.
         """
-        print("\nCaching analysis results...")
-        print(f"  Files to cache: {len(file_paths)}")
-        print(f"  Analyses available: {len(analyzer.analyses)}")
-
-        # Create a mapping from analysis keys to file paths
-        # Note: Analysis keys must match the format used in granger_analysis.py: participant_timepoint_condition
-        analysis_to_file = {}
-        for file_path in file_paths:
-            metadata = self.get_file_metadata_with_cache(file_path)
-            if metadata:
-                analysis_key = f"{metadata['participant_id']}_{metadata['timepoint']}_{metadata['condition']}"
-                analysis_to_file[analysis_key] = file_path
-                print(f"  Mapped {analysis_key} -> {os.path.basename(file_path)}")
-            else:
-                print(f"  Warning: No metadata found for {file_path}")
-
-        print(f"  Analysis key mappings: {len(analysis_to_file)}")
-
-        # Cache results for each analysis
-        cached_count = 0
-        for analysis_key, analysis in analyzer.analyses.items():
-            print(f"  Processing analysis: {analysis_key}")
-            if analysis_key in analysis_to_file:
-                file_path = analysis_to_file[analysis_key]
-
-                try:
-                    # Always try to cache - the database will handle duplicates
-                    print(f"    Caching results for: {os.path.basename(file_path)}")
-                    self.db_service.cache_analysis_result(
-                        file_path=file_path,
-                        analysis_type="granger_causality",
-                        connectivity_matrix=analysis["connectivity_matrix"],
-                        global_metrics=analysis.get("global", {}),
-                        analysis_params={},  # Could be extended with actual parameters
+        logger.info("\nCaching analysis results...")
+        logger.info("  Files to cache: %d", len(file_paths))
+        logger.info("  Analyses available: %d", len(analyzer.analyses))
+
+        # Register metadata and write all results in one transaction, so the
+        # whole batch is committed once rather than once per file
+        with self.db_service.transaction():
+            if path_to_key is None:
+                metadata_by_path = self._register_unknown_files(file_paths)
+                path_to_key = {
+                    file_path: _analysis_key(metadata)
+                    for file_path, metadata in metadata_by_path.items()
+                }
+
+            # Create a mapping from analysis keys to file paths
+            analysis_to_file = {}
+            for file_path in file_paths:
+                analysis_key = path_to_key.get(
+                    file_path, path_to_key.get(os.path.abspath(file_path))
+                )
+                if analysis_key:
+                    analysis_to_file[analysis_key] = file_path
+                    logger.debug(
+                        "  Mapped %s -> %s", analysis_key, os.path.basename(file_path)
                     )
-                    cached_count += 1
-                    print(
-                        f"    ✓ Successfully cached analysis for {os.path.basename(file_path)}"
+                else:
+                    logger.warning("  Warning: No analysis key found for %s", file_path)
+
+            logger.info("  Analysis key mappings: %d", len(analysis_to_file))
+
+            # Cache results for each analysis
+            cached_count = 0
+            for analysis_key, analysis in analyzer.analyses.items():
+                logger.debug("  Processing analysis: %s", analysis_key)
+                if analysis_key in analysis_to_file:
+                    file_path = analysis_to_file[analysis_key]
+
+                    try:
+                        # Always try to cache - the database will handle duplicates
+                        logger.debug(
+                            "    Caching results for: %s", os.path.basename(file_path)
+                        )
+                        self.db_service.cache_analysis_result(
+                            file_path=file_path,
+                            analysis_type="granger_causality",
+                            connectivity_matrix=analysis["connectivity_matrix"],
+                            global_metrics=analysis.get("global", {}),
+                            analysis_params={},  # Could be extended with actual parameters
+                        )
+                        cached_count += 1
+                        logger.debug(
+                            "    ✓ Successfully cached analysis for %s",
+                            os.path.basename(file_path),
+                        )
+                    except Exception as e:
+                        logger.error(
+                            "    ✗ Failed to cache results for %s: %s",
+                            file_path,
+                            e,
+                            exc_info=logger.isEnabledFor(logging.DEBUG),
+                        )
+                else:
+                    logger.warning(
+                        "    Warning: No file mapping found for analysis key: %s",
+                        analysis_key,
                     )
-                except Exception as e:
-                    print(f"    ✗ Failed to cache results for {file_path}: {e}")
-                    import traceback
-
-                    traceback.print_exc()
-            else:
-                print(
-                    f"    Warning: No file mapping found for analysis key: {analysis_key}"
-                )
 
-        print(f"  Cached {cached_count} new analysis results")
+        logger.info("  Cached %d new analysis results", cached_count)
+
+        # Let the query planner see the new table sizes
+        if cached_count:
+            self.db_service.analyze()
 
     def load_and_analyze_files_with_cache(
         self, input_dir: str, force_reload: bool = False
@@ -198,61 +426,75 @@ class CachedDataLoaderService:
         excel_files = find_input_files(input_dir)
 
         if not excel_files:
-            print(f"No Excel files found in {input_dir}")
+            logger.info("No Excel files found in %s", input_dir)
             return None, 0, 0
 
-        print(f"Found {len(excel_files)} Excel files to process")
+        logger.info("Found %d Excel files to process", len(excel_files))
+
+        # Look up the cache status of every file with a single batched query
+        cached_paths = (
+            set() if force_reload else self.db_service.get_cached_paths(excel_files)
+        )
+
         if not force_reload:
             # Check how many are cached
-            cached_count = sum(
-                1 for f in excel_files if self.db_service.is_file_cached(f)
-            )
-            print(f"  {cached_count} files have cached results")
-            print(f"  {len(excel_files) - cached_count} files need processing")
+            cached_count = len(cached_paths)
+            logger.info("  %d files have cached results", cached_count)
+            logger.info("  %d files need processing", len(excel_files) - cached_count)
 
         # Initialize the analyzer
         analyzer = GrangerCausalityAnalyzer()
 
-        # Load each file (with caching)
-        successful_loads = 0
-        failed_loads = 0
+        # Register metadata of new files up front in one transaction, so the
+        # loading workers below only need to read from the database
+        with self.db_service.transaction():
+            self._register_unknown_files(excel_files)
 
-        for file_path in excel_files:
-            if self.load_single_file_with_cache(analyzer, file_path, force_reload):
-                successful_loads += 1
-            else:
-                failed_loads += 1
+        # Load each file (with caching)
+        results = self.load_files_parallel(
+            analyzer, excel_files, force_reload, cached_paths
+        )
+        successful_loads = sum(1 for result in results if result)
+        failed_loads = len(results) - successful_loads
 
-        print(f"\nLoading Summary:")
-        print(f"  Successfully loaded: {successful_loads} files")
-        print(f"  Failed to load: {failed_loads} files")
+        logger.info("\nLoading Summary:")
+        logger.info("  Successfully loaded: %d files", successful_loads)
+        logger.info("  Failed to load: %d files", failed_loads)
 
         if successful_loads == 0:
-            print("No files were successfully loaded.")
+            logger.info("No files were successfully loaded.")
             return analyzer, successful_loads, failed_loads
 
         # Check if we need to run analysis (only if we have uncached files)
         uncached_files = [
-            f
-            for f in excel_files
-            if not self.db_service.is_file_cached(f) or force_reload
+            f for f, result in zip(excel_files, results) if result is LoadResult.FRESH
         ]
 
         if uncached_files or force_reload:
-            print(f"\nRunning analysis on {len(uncached_files)} uncached files...")
+            logger.info(
+                "\nRunning analysis on %d uncached files...", len(uncached_files)
+            )
             try:
                 analyzer.analyze_all_data()
-                print("✓ Analysis completed successfully")
+                logger.info("✓ Analysis completed successfully")
 
-                # Cache the new results
-                self.cache_analysis_results(analyzer, uncached_files)
+                # Cache the new results, reusing the keys computed while loading
+                path_to_key = {
+                    f: self._path_to_key[os.path.abspath(f)]
+                    for f in uncached_files
+                    if os.path.abspath(f) in self._path_to_key
+                }
+                self.cache_analysis_results(analyzer, uncached_files, path_to_key)
 
             except Exception as e:
-                print(f"✗ Analysis failed: {str(e)}")
-                traceback.print_exc()
+                logger.error(
+                    "✗ Analysis failed: %s",
+                    e,
+                    exc_info=logger.isEnabledFor(logging.DEBUG),
+                )
                 raise
         else:
-            print("\nAll files loaded from cache - no analysis needed")
+            logger.info("\nAll files loaded from cache - no analysis needed")
 
         return analyzer, successful_loads, failed_loads
 
@@ -275,9 +517,16 @@ class CachedDataLoaderService:
 
     def cleanup_cache(self):
         """Clean up orphaned cache records"""
-        print("Cleaning up cache...")
+        logger.info("Cleaning up cache...")
+        with self._meta_lock:
+            self._meta_cache.clear()
+        self._path_to_key.clear()
         self.db_service.cleanup_orphaned_records()
 
+    def close(self):
+        """Close the database connection held by this service"""
+        self.db_service.close()
+
     def get_cache_stats(self) -> Dict:
         """Get cache statistics"""
         return self.db_service.get_database_stats()
@@ -289,9 +538,12 @@ class CachedDataLoaderService:
         Args:
             file_path (str): Path to the file to clear from cache
         """
-        # This would require adding a method to DatabaseService
-        # For now, we can force reload by using force_reload=True
-        pass
+        with self._meta_lock:
+            self._meta_cache.pop(os.path.abspath(file_path), None)
+        self._path_to_key.pop(os.path.abspath(file_path), None)
+
+        # Clearing the database rows would require adding a method to
+        # DatabaseService. For now, we can force reload by using force_reload=True
 
 
 # Convenience functions
@@ -317,4 +569,7 @@ def load_files_with_cache(
         tuple: (analyzer, successful_loads, failed_loads)
     """
     service = CachedDataLoaderService(db_path)
-    return service.load_and_analyze_files_with_cache(input_dir, force_reload)
+    try:
+        return service.load_and_analyze_files_with_cache(input_dir, force_reload)
+    finally:
+        service.close()
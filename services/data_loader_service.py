@@ -7,23 +7,33 @@ This service handles file discovery, metadata extraction, data loading, and anal
 
 import os
 import re
-import glob
 import traceback
+from collections import defaultdict
 from granger_analysis import GrangerCausalityAnalyzer
 
+# Filename patterns, compiled once at import time
+# IDxCONyTIz with an optional GRw group suffix
+ID_FILENAME_PATTERN = re.compile(r"ID(\d+)CON(\d+)TI(\d+)(?:GR(\d+))?", re.IGNORECASE)
+# UTF-xx_Ty_condition
+UTF_FILENAME_PATTERN = re.compile(r"UTF-(\w+)_T(\d+)_(\w+)", re.IGNORECASE)
 
-def extract_metadata_from_filename(filename):
+
+def extract_metadata_from_filename(filename, stem=None):
     """
     Extract metadata (participant ID, condition, timepoint, group) from filename
 
     Args:
-        filename (str): The filename (without path)
+        filename (str): The filename (a full path is also accepted)
+        stem (str, optional): The filename without directory and extension,
+            if the caller has already split it off
 
     Returns:
         dict: Metadata dictionary with keys: participant_id, condition, timepoint, group
     """
-    # Remove extension
-    base_name = os.path.splitext(filename)[0]
+    # Remove directory and extension
+    base_name = (
+        stem if stem is not None else os.path.splitext(os.path.basename(filename))[0]
+    )
 
     # Initialize metadata
     metadata = {
@@ -33,25 +43,22 @@ def extract_metadata_from_filename(filename):
         "group": "",
     }
 
-    # Pattern 1: IDxCONyTIzGRw (full pattern with group)
-    match = re.search(r"ID(\d+)CON(\d+)TI(\d+)GR(\d+)", base_name, re.IGNORECASE)
-    if match:
-        metadata["participant_id"] = match.group(1)
-        metadata["condition"] = match.group(2)
-        metadata["timepoint"] = match.group(3)
-        metadata["group"] = match.group(4)
-        return metadata
+    # Cheap substring tests decide which pattern can possibly match, so each
+    # filename runs at most one regex search
+    upper_name = base_name.upper()
 
-    # Pattern 2: IDxCONyTIz (no group)
-    match = re.search(r"ID(\d+)CON(\d+)TI(\d+)", base_name, re.IGNORECASE)
+    # Patterns 1 and 2: IDxCONyTIzGRw (full pattern with group) or IDxCONyTIz (no group)
+    match = "ID" in upper_name and ID_FILENAME_PATTERN.search(base_name)
     if match:
         metadata["participant_id"] = match.group(1)
         metadata["condition"] = match.group(2)
         metadata["timepoint"] = match.group(3)
+        if match.group(4) is not None:
+            metadata["group"] = match.group(4)
         return metadata
 
     # Pattern 3: UTF format (UTF-xx_Ty_condition)
-    match = re.search(r"UTF-(\w+)_T(\d+)_(\w+)", base_name, re.IGNORECASE)
+    match = "UTF-" in upper_name and UTF_FILENAME_PATTERN.search(base_name)
     if match:
         metadata["participant_id"] = match.group(1)
         metadata["timepoint"] = match.group(2)
@@ -63,13 +70,13 @@ def extract_metadata_from_filename(filename):
     if len(parts) >= 3:
         # Try to identify parts that look like participant ID, timepoint, condition
         for i, part in enumerate(parts):
-            if part.startswith("UTF-") or part.startswith("ID"):
+            if part.startswith(("UTF-", "ID")):
                 metadata["participant_id"] = part.replace("UTF-", "").replace("ID", "")
-            elif part.startswith("T") and part[1:].isdigit():
+            elif part[:1] == "T" and part[1:].isdigit():
                 metadata["timepoint"] = part
-            elif part.startswith("CON") and part[3:].isdigit():
+            elif part[:3] == "CON" and part[3:].isdigit():
                 metadata["condition"] = part[3:]
-            elif i == 0 and not metadata["participant_id"] != "unknown":
+            elif i == 0 and metadata["participant_id"] == "unknown":
                 metadata["participant_id"] = part
             elif i == 1 and metadata["timepoint"] == "unknown":
                 metadata["timepoint"] = part
@@ -98,12 +105,21 @@ def find_input_files(input_dir):
     Returns:
         list: List of Excel file paths
     """
-    excel_extensions = ["*.xlsx", "*.xls", "*.XLSX", "*.XLS"]
-    files = []
-
-    for ext in excel_extensions:
-        pattern = os.path.join(input_dir, ext)
-        files.extend(glob.glob(pattern))
+    excel_extensions = (".xlsx", ".xls")
+
+    if not os.path.isdir(input_dir):
+        return []
+
+    # One directory listing, matching extensions case-insensitively; hidden
+    # files are skipped as glob would
+    with os.scandir(input_dir) as entries:
+        files = [
+            entry.path
+            for entry in entries
+            if not entry.name.startswith(".")
+            and entry.name.lower().endswith(excel_extensions)
+            and entry.is_file()
+        ]
 
     return sorted(files)
 
@@ -186,6 +202,65 @@ def load_and_analyze_files(input_dir):
     return analyzer, successful_loads, failed_loads
 
 
+# Attributes the services memoize results derived from analyzer.analyses on
+ANALYZER_CACHES = ("_grouping_cache", "_pairwise_cache", "_pairs_cache")
+
+
+def _group_analyses(analyzer, field):
+    """
+    Group analyses by a metadata field, memoized on the analyzer
+
+    The result is cached in ``analyzer._grouping_cache``, so repeated visualization
+    and report passes over the same analyzer share one traversal. Every change to
+    ``analyzer.analyses`` clears the cache (see clear_grouping_cache); the cache
+    also holds the dictionary it was built from and its size, so a replaced
+    dictionary or an added analysis is noticed as well. Callers must treat the
+    returned dictionary as read-only.
+
+    Args:
+        analyzer: GrangerCausalityAnalyzer instance
+        field (str): Metadata key to group by
+
+    Returns:
+        dict: Dictionary mapping field value to list of (analysis_key, analysis) tuples
+    """
+    analyses = analyzer.analyses
+
+    cache = getattr(analyzer, "_grouping_cache", None)
+    if cache is None:
+        cache = analyzer._grouping_cache = {}
+
+    cached = cache.get(field)
+    # A reference to the dictionary, not its id(), which a new dictionary can
+    # reuse once the old one is freed
+    if cached is not None and cached[0] is analyses and cached[1] == len(analyses):
+        return cached[2]
+
+    grouped = defaultdict(list)
+    for analysis_key, analysis in analyses.items():
+        grouped[analysis["metadata"][field]].append((analysis_key, analysis))
+
+    grouped = dict(grouped)
+    cache[field] = (analyses, len(analyses), grouped)
+    return grouped
+
+
+def clear_grouping_cache(analyzer):
+    """
+    Drop the groupings memoized on an analyzer, and the pairwise values and
+    scales memoized alongside them
+
+    Call this after replacing entries of ``analyzer.analyses`` in place, which
+    keeps the dictionary's identity and size and so goes unnoticed otherwise,
+    or after editing analysis values in place.
+
+    Args:
+        analyzer: GrangerCausalityAnalyzer instance
+    """
+    for cache in ANALYZER_CACHES:
+        analyzer.__dict__.pop(cache, None)
+
+
 def group_analyses_by_participant(analyzer):
     """
     Group analyses by participant ID
@@ -196,14 +271,7 @@ def group_analyses_by_participant(analyzer):
     Returns:
         dict: Dictionary mapping participant_id to list of (analysis_key, analysis) tuples
     """
-    participant_analyses = {}
-    for analysis_key, analysis in analyzer.analyses.items():
-        participant_id = analysis["metadata"]["participant_id"]
-        if participant_id not in participant_analyses:
-            participant_analyses[participant_id] = []
-        participant_analyses[participant_id].append((analysis_key, analysis))
-
-    return participant_analyses
+    return _group_analyses(analyzer, "participant_id")
 
 
 def group_analyses_by_condition(analyzer):
@@ -216,11 +284,4 @@ def group_analyses_by_condition(analyzer):
     Returns:
         dict: Dictionary mapping condition to list of (analysis_key, analysis) tuples
     """
-    condition_analyses = {}
-    for analysis_key, analysis in analyzer.analyses.items():
-        condition = analysis["metadata"]["condition"]
-        if condition not in condition_analyses:
-            condition_analyses[condition] = []
-        condition_analyses[condition].append((analysis_key, analysis))
-
-    return condition_analyses
+    return _group_analyses(analyzer, "condition")
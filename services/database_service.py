@@ -10,29 +10,548 @@ import os
 import sqlite3
 import json
 import hashlib
+import io
+import logging
+import mmap
+import threading
+import zlib
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
-import pandas as pd
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+import numpy as np
+
+if TYPE_CHECKING:
+    # pandas is imported where matrices are rebuilt, so importing this module
+    # (e.g. to check the cache or list files) does not load it
+    import pandas as pd
+
+try:
+    import blake3
+except ImportError:  # optional, hashlib.blake2b is used instead
+    blake3 = None
+
+try:
+    import zstandard
+except ImportError:  # optional, zlib is used instead
+    zstandard = None
+
+try:
+    import orjson
+except ImportError:  # optional, the json module is used instead
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Keep IN (...) lists well below SQLite's default 999 bound-parameter limit
+IN_CLAUSE_CHUNK_SIZE = 512
+
+# Threads used for file-system work (stat, existence checks, hashing); a few
+# per core hides the latency of individual reads
+IO_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Read size used when hashing files
+HASH_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Files up to this size are memory-mapped and hashed in a single update call
+HASH_MMAP_LIMIT = 1 << 30  # 1 GiB
+
+# Algorithm tag stored in front of every file hash, so hashes made with a
+# different algorithm (including untagged MD5 hashes from older versions)
+# never compare equal and the file is treated as changed
+FILE_HASH_ALGORITHM = "blake3" if blake3 is not None else "blake2b"
+
+# Codec used to compress newly cached matrices; the codec of each row is
+# stored with it, so rows written with another codec stay readable
+MATRIX_CODEC = "zstd" if zstandard is not None else "zlib"
+
+# Prepared statements kept per connection (the sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 512
+
+# Idle connections kept open for reuse, enough for one per loader thread
+CONNECTION_POOL_SIZE = os.cpu_count() or 4
+
+# Per-connection tuning applied to every connection the service opens
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",  # safe with WAL, avoids an fsync per commit
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 MB page cache
+    "PRAGMA mmap_size=268435456",  # 256 MB memory-mapped I/O
+    "PRAGMA busy_timeout=30000",  # wait up to 30 s for a competing writer
+    "PRAGMA foreign_keys=ON",
+)
+
+# Extra PRAGMAs per durability level, applied after CONNECTION_PRAGMAS.
+# "cache" treats the database as regenerable: commits are not synced, so a
+# crash can corrupt the file and it then has to be deleted and rebuilt. Only
+# one process may use the database in this mode.
+DURABILITY_PRAGMAS = {
+    "safe": (),
+    "cache": ("PRAGMA synchronous=OFF",),
+}
+
+# Journal mode each durability level switches the database to when the service
+# is created. Only WAL is stored in the database file; any other mode is per
+# connection, so "cache" connections use the default rollback journal.
+JOURNAL_MODES = {"safe": "wal", "cache": "delete"}
+
+
+def _chunked(items: List, size: int = IN_CLAUSE_CHUNK_SIZE):
+    """Yield successive slices of at most ``size`` items"""
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+@lru_cache(maxsize=4096)
+def _normpath(path: str) -> str:
+    """Memoized os.path.normpath"""
+    return os.path.normpath(path)
+
+
+def _abspath(path: str) -> str:
+    """
+    os.path.abspath without the getcwd() call for paths that are already absolute
+
+    Absolute paths are only normalized, which is pure string work and memoized.
+    Relative paths depend on the working directory, so they are never cached.
+    """
+    if os.path.isabs(path):
+        return _normpath(path)
+    return os.path.abspath(path)
+
+
+def _stat_matches(
+    stat: os.stat_result,
+    mtime_ns: Optional[int],
+    file_size: int,
+    last_modified: float,
+) -> bool:
+    """
+    Whether a file's stat matches the size and modification time stored for it
+
+    Rows registered before mtime_ns was recorded compare the float mtime.
+    """
+    if mtime_ns is not None:
+        return mtime_ns == stat.st_mtime_ns and file_size == stat.st_size
+    return last_modified == stat.st_mtime and file_size == stat.st_size
+
+
+def _upsert_file(conn: sqlite3.Connection, row: Tuple) -> int:
+    """Insert or update a files row (SQL_UPSERT_FILE parameters), returning its id"""
+    if SQLITE_HAS_RETURNING:
+        return conn.execute(SQL_UPSERT_FILE_RETURNING_ID, row).fetchone()[0]
+    conn.execute(SQL_UPSERT_FILE, row)
+    return conn.execute(SQL_SELECT_FILE_ID, (row[0],)).fetchone()[0]
+
+
+def _in_clauses(items: List):
+    """
+    Yield ``(placeholders, params)`` pairs for ``IN (...)`` queries over items
+
+    Each chunk is padded with NULLs, which never match, up to the next power of
+    two. Only a handful of distinct SQL strings are then ever built, so the
+    prepared statements are reused from the connection's statement cache
+    instead of being prepared again for every list length.
+    """
+    for chunk in _chunked(items):
+        size = 1 << (len(chunk) - 1).bit_length()
+        yield ",".join("?" * size), [*chunk, *([None] * (size - len(chunk)))]
+
+
+# Columns added to the tables after their first release, with their types.
+# Databases created by older versions are migrated on startup.
+FILES_MIGRATIONS = {
+    "mtime_ns": "INTEGER",
+}
+ANALYSIS_RESULTS_MIGRATIONS = {
+    "matrix_blob": "BLOB",
+    "matrix_rows": "INTEGER",
+    "matrix_cols": "INTEGER",
+    "matrix_dtype": "TEXT",
+    "matrix_columns": "TEXT",
+    "matrix_codec": "TEXT",
+}
+
+# Columns returned by get_all_files, in covering index order after id
+FILE_RECORD_COLUMNS = (
+    "id",
+    "participant_id",
+    "condition",
+    "timepoint",
+    "file_path",
+    "group_info",
+    "file_size",
+    "last_modified",
+)
+
+# SQL used by the per-file methods, defined once so every call hands sqlite3
+# the same string and hits the connection's prepared-statement cache
+SQL_SELECT_FILE_STATE = """
+    SELECT id, file_hash, last_modified, mtime_ns, file_size
+    FROM files WHERE file_path = ?
+"""
+SQL_SELECT_FILE_ID = "SELECT id FROM files WHERE file_path = ?"
+SQL_INSERT_FILE = """
+    INSERT INTO files (file_path, file_hash, file_size, last_modified, mtime_ns,
+                       participant_id, condition, timepoint, group_info)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SQL_UPSERT_FILE = (
+    SQL_INSERT_FILE
+    + """
+    ON CONFLICT(file_path) DO UPDATE SET
+    file_hash = excluded.file_hash, file_size = excluded.file_size,
+    last_modified = excluded.last_modified, mtime_ns = excluded.mtime_ns,
+    participant_id = excluded.participant_id, condition = excluded.condition,
+    timepoint = excluded.timepoint, group_info = excluded.group_info,
+    updated_at = CURRENT_TIMESTAMP
+"""
+)
+SQL_UPSERT_FILE_RETURNING_ID = SQL_UPSERT_FILE + "RETURNING id"
+# RETURNING needs SQLite 3.35; older builds look the id up after the UPSERT
+SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+SQL_UPDATE_FILE_STAT = """
+    UPDATE files SET file_size = ?, last_modified = ?, mtime_ns = ?
+    WHERE id = ?
+"""
+SQL_FILL_MTIME_NS = "UPDATE files SET mtime_ns = ? WHERE id = ? AND mtime_ns IS NULL"
+SQL_DELETE_FILE_RESULTS = "DELETE FROM analysis_results WHERE file_id = ?"
+SQL_GET_META = """
+    SELECT participant_id, condition, timepoint, group_info
+    FROM files WHERE file_path = ?
+"""
+SQL_INSERT_ANALYSIS = """
+    INSERT OR REPLACE INTO analysis_results
+    (file_id, analysis_type, global_metrics, electrode_list, analysis_params,
+     matrix_blob, matrix_rows, matrix_cols, matrix_dtype, matrix_columns, matrix_codec)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SQL_SELECT_ANALYSIS = """
+    SELECT ar.connectivity_matrix, ar.global_metrics, ar.electrode_list, ar.analysis_params,
+           ar.matrix_blob, ar.matrix_rows, ar.matrix_cols, ar.matrix_dtype, ar.matrix_columns,
+           ar.matrix_codec
+    FROM analysis_results ar
+    JOIN files f ON ar.file_id = f.id
+    WHERE f.file_path = ? AND ar.analysis_type = ?
+"""
+SQL_SELECT_BUNDLE = """
+    SELECT ar.connectivity_matrix, ar.global_metrics, ar.electrode_list, ar.analysis_params,
+           ar.matrix_blob, ar.matrix_rows, ar.matrix_cols, ar.matrix_dtype, ar.matrix_columns,
+           ar.matrix_codec, f.participant_id, f.condition, f.timepoint, f.group_info
+    FROM analysis_results ar
+    JOIN files f ON ar.file_id = f.id
+    WHERE f.file_path = ? AND ar.analysis_type = ?
+"""
+# Yields no row when nothing is cached, otherwise whether the stored stat still
+# matches (legacy rows without mtime_ns compare the float mtime)
+SQL_CHECK_CACHED = """
+    SELECT f.file_size = ? AND CASE WHEN f.mtime_ns IS NOT NULL
+        THEN f.mtime_ns = ? ELSE f.last_modified = ? END
+    FROM files f
+    JOIN analysis_results ar ON f.id = ar.file_id AND ar.analysis_type = ?
+    WHERE f.file_path = ?
+"""
+SQL_CHECK_CACHED_HASH = """
+    SELECT EXISTS(
+        SELECT 1 FROM files f
+        JOIN analysis_results ar ON f.id = ar.file_id AND ar.analysis_type = ?
+        WHERE f.file_path = ? AND f.file_hash = ?
+    )
+"""
+
+# Batched variants, formatted with the placeholders from _in_clauses()
+SQL_SELECT_FILE_STATES_IN = """
+    SELECT file_path, id, file_hash, mtime_ns, file_size, last_modified
+    FROM files WHERE file_path IN ({placeholders})
+"""
+SQL_SELECT_FILE_IDS_IN = (
+    "SELECT file_path, id FROM files WHERE file_path IN ({placeholders})"
+)
+SQL_GET_META_IN = """
+    SELECT file_path, participant_id, condition, timepoint, group_info
+    FROM files WHERE file_path IN ({placeholders})
+"""
+SQL_CHECK_CACHED_IN = """
+    SELECT f.file_path, f.mtime_ns, f.file_size, f.file_hash, f.last_modified
+    FROM files f
+    JOIN analysis_results ar ON f.id = ar.file_id AND ar.analysis_type = ?
+    WHERE f.file_path IN ({placeholders})
+"""
+SQL_DELETE_RESULTS_IN = "DELETE FROM analysis_results WHERE file_id IN ({placeholders})"
+
+# Orphan cleanup: the ids of files still on disk go into a temp table and
+# everything else is deleted with one statement per table
+SQL_CREATE_ALIVE = "CREATE TEMP TABLE IF NOT EXISTS tmp_alive (id INTEGER PRIMARY KEY)"
+SQL_INSERT_ALIVE = "INSERT INTO tmp_alive VALUES (?)"
+SQL_DELETE_DEAD_RESULTS = (
+    "DELETE FROM analysis_results WHERE file_id NOT IN (SELECT id FROM tmp_alive)"
+)
+SQL_DELETE_DEAD_FILES = "DELETE FROM files WHERE id NOT IN (SELECT id FROM tmp_alive)"
+SQL_DROP_ALIVE = "DROP TABLE tmp_alive"
+
+
+def _compress(data: bytes) -> bytes:
+    """Compress matrix bytes with MATRIX_CODEC"""
+    if MATRIX_CODEC == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return zlib.compress(data, 1)
+
+
+def _decompress(data: bytes, codec: Optional[str]) -> bytes:
+    """Undo _compress for a row stored with ``codec`` (None: uncompressed)"""
+    if codec is None:
+        return data
+    if codec == "zlib":
+        return zlib.decompress(data)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError(
+                "Cached matrix is zstd-compressed; install 'zstandard' to read it"
+            )
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unknown matrix codec: {codec}")
+
+
+def _serialize_matrix(connectivity_matrix: "pd.DataFrame") -> Tuple:
+    """
+    Serialize a connectivity matrix to compressed bytes plus the metadata
+    needed to rebuild it
+
+    Returns:
+        tuple: (blob, rows, cols, dtype, electrode_list_json, columns_json, codec)
+    """
+    values = np.ascontiguousarray(connectivity_matrix.to_numpy())
+    if values.dtype.kind not in "biuf":
+        values = values.astype(np.float64)
+
+    return (
+        sqlite3.Binary(_compress(values.tobytes())),
+        values.shape[0],
+        values.shape[1],
+        values.dtype.str,  # includes byte order, e.g. '<f8'
+        _dump_labels(list(connectivity_matrix.index)),
+        _dump_labels(list(connectivity_matrix.columns)),
+        MATRIX_CODEC,
+    )
+
+
+def _dump_labels(labels) -> str:
+    """
+    JSON-encode a list of matrix labels, with orjson when it is installed
+
+    Only used for labels: orjson writes NaN as null, so metrics, which may
+    legitimately be NaN, stay on json.dumps to round-trip unchanged.
+    """
+    if orjson is not None:
+        return orjson.dumps(labels, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(labels)
+
+
+def _load_json(text: str):
+    """Decode a stored JSON column, with orjson when it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass  # NaN/Infinity written by json.dumps, which orjson rejects
+    return json.loads(text)
+
+
+def _deserialize_matrix(
+    blob, rows, cols, dtype, electrode_json, columns_json, matrix_json, codec=None
+) -> "pd.DataFrame":
+    """Rebuild a connectivity matrix stored by _serialize_matrix"""
+    import pandas as pd
+
+    if blob is None:
+        # Row written before matrices were stored as raw bytes
+        return pd.read_json(io.StringIO(matrix_json), orient="index")
+
+    # bytearray gives numpy a writable buffer for the array to wrap
+    values = np.frombuffer(
+        bytearray(_decompress(blob, codec)), dtype=np.dtype(dtype)
+    ).reshape(rows, cols)
+    return pd.DataFrame(
+        values, index=_load_json(electrode_json), columns=_load_json(columns_json)
+    )
+
+
+def _analysis_from_row(row: Tuple) -> Dict:
+    """Deserialize an analysis_results row selected as in get_cached_analysis"""
+    (
+        matrix_json,
+        metrics_json,
+        electrode_json,
+        params_json,
+        matrix_blob,
+        matrix_rows,
+        matrix_cols,
+        matrix_dtype,
+        matrix_columns,
+        matrix_codec,
+    ) = row
+
+    return {
+        "connectivity_matrix": _deserialize_matrix(
+            matrix_blob,
+            matrix_rows,
+            matrix_cols,
+            matrix_dtype,
+            electrode_json,
+            matrix_columns,
+            matrix_json,
+            matrix_codec,
+        ),
+        "global_metrics": _load_json(metrics_json) if metrics_json else {},
+        "electrode_list": _load_json(electrode_json),
+        "analysis_params": _load_json(params_json) if params_json else {},
+    }
 
 
 class DatabaseService:
     """Service for managing SQLite database operations"""
 
-    def __init__(self, db_path: str = "granger_cache.db"):
+    def __init__(self, db_path: str = "granger_cache.db", durability: str = "safe"):
         """
         Initialize the database service
 
         Args:
             db_path (str): Path to the SQLite database file
+            durability (str): "safe" (default, WAL with synced checkpoints) or
+                "cache" for faster writes without crash safety, see
+                DURABILITY_PRAGMAS
         """
+        if durability not in DURABILITY_PRAGMAS:
+            raise ValueError(
+                f"durability must be one of {sorted(DURABILITY_PRAGMAS)}, got {durability!r}"
+            )
+
         self.db_path = db_path
+        self.durability = durability
+        # Idle connections shared by all threads, see _acquire()
+        self._pool: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        # Per-thread state: the connection of the thread's open transaction()
+        self._local = threading.local()
         self._init_database()
 
+    @property
+    def _transaction_conn(self) -> Optional[sqlite3.Connection]:
+        """Connection of the transaction() open in the calling thread, if any"""
+        return getattr(self._local, "transaction_conn", None)
+
+    @_transaction_conn.setter
+    def _transaction_conn(self, conn: Optional[sqlite3.Connection]):
+        self._local.transaction_conn = conn
+
+    def _connect(self, **kwargs) -> sqlite3.Connection:
+        """Open a new connection to the database with the tuning PRAGMAs applied"""
+        conn = sqlite3.connect(
+            self.db_path, cached_statements=STATEMENT_CACHE_SIZE, **kwargs
+        )
+        for pragma in CONNECTION_PRAGMAS + DURABILITY_PRAGMAS[self.durability]:
+            conn.execute(pragma)
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        """
+        Take an idle connection from the pool, opening a new one if it is empty
+
+        Pooled connections stay open across calls and across threads (e.g. the
+        loader's worker threads), so the database is not reopened and its
+        schema not parsed again on every call. A connection is only ever used
+        by one thread at a time.
+        """
+        with self._pool_lock:
+            if self._pool:
+                return self._pool.pop()
+        return self._connect(check_same_thread=False)
+
+    def _release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool, closing it if the pool is full"""
+        with self._pool_lock:
+            if len(self._pool) < CONNECTION_POOL_SIZE:
+                self._pool.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        """
+        Close the idle pooled connections
+
+        The service stays usable; a new connection is opened on the next call.
+        """
+        with self._pool_lock:
+            pool, self._pool = self._pool, []
+        for conn in pool:
+            conn.close()
+
+    @contextmanager
+    def _connection(self):
+        """
+        Yield a connection for a single method call
+
+        Inside transaction() the transaction's connection is reused so the
+        statement becomes part of it; otherwise a pooled connection is used
+        and the call is committed on success.
+        """
+        if self._transaction_conn is not None:
+            yield self._transaction_conn
+            return
+
+        conn = self._acquire()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self._release(conn)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group several service calls into one write transaction
+
+        All DatabaseService calls made inside the ``with`` block share a single
+        connection and are committed together, instead of each call committing
+        (and syncing to disk) on its own. The transaction is rolled back if the
+        block raises. Nested uses join the outer transaction. Transactions are
+        per thread; calls from other threads use their own connections.
+        """
+        if self._transaction_conn is not None:
+            yield self._transaction_conn
+            return
+
+        conn = self._acquire()
+        conn.execute("BEGIN IMMEDIATE")
+        self._transaction_conn = conn
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            self._transaction_conn = None
+            self._release(conn)
+
     def _init_database(self):
-        """Initialize the database and create tables if they don't exist"""
-        with sqlite3.connect(self.db_path) as conn:
+        """
+        Initialize the database and create tables if they don't exist
+
+        With "safe" durability the database is switched to write-ahead logging
+        (WAL), which lets readers proceed while a write is in progress. WAL
+        mode is persistent and keeps ``-wal``/``-shm`` sidecar files next to
+        the database file while it is in use; "cache" durability switches the
+        database back to a rollback journal, see JOURNAL_MODES.
+        """
+        with self._connection() as conn:
             cursor = conn.cursor()
 
+            # In-memory databases have no journal file to switch
+            if self.db_path != ":memory:":
+                self._set_journal_mode(cursor, JOURNAL_MODES[self.durability])
+
             # Create files table for tracking processed files
             cursor.execute(
                 """
@@ -42,6 +561,7 @@ class DatabaseService:
                     file_hash TEXT NOT NULL,
                     file_size INTEGER NOT NULL,
                     last_modified REAL NOT NULL,
+                    mtime_ns INTEGER,          -- st_mtime_ns when last registered
                     participant_id TEXT,
                     condition TEXT,
                     timepoint TEXT,
@@ -59,50 +579,184 @@ class DatabaseService:
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     file_id INTEGER NOT NULL,
                     analysis_type TEXT NOT NULL,
-                    connectivity_matrix TEXT,  -- JSON serialized matrix
+                    connectivity_matrix TEXT,  -- JSON serialized matrix (legacy rows)
                     global_metrics TEXT,       -- JSON serialized global metrics
                     electrode_list TEXT,       -- JSON serialized electrode list
                     analysis_params TEXT,      -- JSON serialized analysis parameters
+                    matrix_blob BLOB,          -- raw matrix values (C order)
+                    matrix_rows INTEGER,
+                    matrix_cols INTEGER,
+                    matrix_dtype TEXT,         -- numpy dtype string, e.g. '<f8'
+                    matrix_columns TEXT,       -- JSON serialized column labels
+                    matrix_codec TEXT,         -- compression of matrix_blob, NULL if none
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (file_id) REFERENCES files (id),
+                    FOREIGN KEY (file_id) REFERENCES files (id) ON DELETE CASCADE,
                     UNIQUE(file_id, analysis_type)
                 )
             """
             )
 
-            # Create index for faster lookups
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_file_path ON files (file_path)"
-            )
+            # Add columns missing from databases created by older versions
+            for table, migrations in (
+                ("files", FILES_MIGRATIONS),
+                ("analysis_results", ANALYSIS_RESULTS_MIGRATIONS),
+            ):
+                cursor.execute(f"PRAGMA table_info({table})")
+                existing_columns = {row[1] for row in cursor.fetchall()}
+                for column, column_type in migrations.items():
+                    if column not in existing_columns:
+                        cursor.execute(
+                            f"ALTER TABLE {table} ADD COLUMN {column} {column_type}"
+                        )
+
+            # Create index for faster lookups. Lookups by file_path and by
+            # file_id / (file_id, analysis_type) are served by the indexes SQLite
+            # builds for the UNIQUE constraints above, so the explicit copies
+            # older versions created only cost an extra B-tree write per row.
+            cursor.execute("DROP INDEX IF EXISTS idx_file_path")
+            cursor.execute("DROP INDEX IF EXISTS idx_analysis_file")
             cursor.execute(
                 "CREATE INDEX IF NOT EXISTS idx_file_hash ON files (file_hash)"
             )
+            # Covers get_all_files: filtered and ordered by the leading columns,
+            # with the remaining record columns stored in the index itself
             cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_analysis_file ON analysis_results (file_id)"
+                f"""
+                CREATE INDEX IF NOT EXISTS idx_files_pct
+                ON files ({', '.join(FILE_RECORD_COLUMNS[1:])})
+                """
             )
 
-            conn.commit()
+            self._migrate_legacy_matrices(conn)
+
+            # Gather planner statistics once; analyze() refreshes them later
+            has_stats = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            ).fetchone()
+            if not has_stats:
+                cursor.execute("ANALYZE")
+
+    def _set_journal_mode(self, cursor: sqlite3.Cursor, journal_mode: str):
+        """
+        Switch the database to ``journal_mode``
+
+        Switching into or out of WAL needs the database to itself. While
+        another connection has it open the current mode is kept (the service
+        works in either mode) and a warning is logged.
+        """
+        try:
+            current_mode = cursor.execute(
+                f"PRAGMA journal_mode={journal_mode}"
+            ).fetchone()[0]
+        except sqlite3.OperationalError as e:
+            current_mode = f"unchanged ({e})"
+        if current_mode != journal_mode:
+            logger.warning(
+                "Could not switch %s to journal_mode=%s, it is in use by another "
+                "connection; journal mode is %s",
+                self.db_path,
+                journal_mode,
+                current_mode,
+            )
+
+    def _migrate_legacy_matrices(self, conn: sqlite3.Connection):
+        """
+        Convert matrices cached as JSON by older versions to the BLOB format
+
+        Runs once per legacy row; afterwards every cached matrix is read with
+        np.frombuffer instead of being parsed with pd.read_json. Rows whose
+        matrix index does not match their stored electrode list are left as
+        they are, since the BLOB format labels rows with that list.
+        """
+        legacy_rows = conn.execute(
+            """
+            SELECT id, connectivity_matrix, electrode_list FROM analysis_results
+            WHERE matrix_blob IS NULL AND connectivity_matrix IS NOT NULL
+        """
+        ).fetchall()
+        if not legacy_rows:
+            return
+
+        import pandas as pd
+
+        updates = []
+        for result_id, matrix_json, electrode_json in legacy_rows:
+            matrix = pd.read_json(io.StringIO(matrix_json), orient="index")
+            if list(matrix.index) != _load_json(electrode_json):
+                continue
+            blob, rows, cols, dtype, _, columns_json, codec = _serialize_matrix(matrix)
+            updates.append((blob, rows, cols, dtype, columns_json, codec, result_id))
+
+        conn.executemany(
+            """
+            UPDATE analysis_results SET
+            matrix_blob = ?, matrix_rows = ?, matrix_cols = ?, matrix_dtype = ?,
+            matrix_columns = ?, matrix_codec = ?, connectivity_matrix = NULL
+            WHERE id = ?
+        """,
+            updates,
+        )
+        if updates:
+            logger.info("Converted %d cached matrices to binary storage", len(updates))
 
     def _get_file_hash(self, file_path: str) -> str:
         """
-        Calculate MD5 hash of a file for change detection
+        Calculate a content fingerprint of a file for change detection
+
+        BLAKE3 is used when the ``blake3`` package is installed, BLAKE2b
+        otherwise; both are much faster than MD5. The result is tagged with
+        the algorithm, e.g. ``"blake2b:<hex digest>"``. Files are
+        memory-mapped rather than read into a series of bytes objects, except
+        empty ones (which cannot be mapped) and BLAKE2b inputs over
+        HASH_MMAP_LIMIT.
 
         Args:
             file_path (str): Path to the file
 
         Returns:
-            str: MD5 hash of the file
+            str: Tagged hash of the file, or "" if it could not be read
         """
-        hash_md5 = hashlib.md5()
         try:
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
+            if blake3 is not None:
+                hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+                hasher.update_mmap(file_path)
+            else:
+                hasher = hashlib.blake2b()
+                with open(file_path, "rb") as f:
+                    size = os.fstat(f.fileno()).st_size
+                    if 0 < size <= HASH_MMAP_LIMIT:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            hasher.update(mm)
+                    else:
+                        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                            hasher.update(chunk)
+            return f"{FILE_HASH_ALGORITHM}:{hasher.hexdigest()}"
         except Exception as e:
-            print(f"Error calculating hash for {file_path}: {e}")
+            logger.error("Error calculating hash for %s: %s", file_path, e)
             return ""
 
+    def _is_unchanged(
+        self, file_path: str, stat: os.stat_result, cached: Tuple
+    ) -> bool:
+        """
+        Check a file's current stat against the values stored when it was cached
+
+        Like rsync's quick check, the file is only hashed when its size or
+        modification time differ from the stored values.
+
+        Args:
+            file_path (str): Absolute path to the file
+            stat (os.stat_result): Current stat of the file
+            cached (tuple): Stored (mtime_ns, file_size, file_hash, last_modified)
+
+        Returns:
+            bool: True if the file hasn't changed since it was registered
+        """
+        mtime_ns, file_size, file_hash, last_modified = cached
+        if _stat_matches(stat, mtime_ns, file_size, last_modified):
+            return True
+        return file_hash == self._get_file_hash(file_path)
+
     def register_file(self, file_path: str, metadata: Dict) -> int:
         """
         Register a file in the database with its metadata
@@ -114,7 +768,7 @@ class DatabaseService:
         Returns:
             int: File ID in the database
         """
-        file_path = os.path.abspath(file_path)
+        file_path = _abspath(file_path)
 
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
@@ -123,74 +777,172 @@ class DatabaseService:
         stat = os.stat(file_path)
         file_size = stat.st_size
         last_modified = stat.st_mtime
+        mtime_ns = stat.st_mtime_ns
+
+        # Look up the existing record and hash the file before taking the
+        # write lock, so other writers do not wait for the file to be read
+        with self._connection() as conn:
+            existing = conn.execute(SQL_SELECT_FILE_STATE, (file_path,)).fetchone()
+
+        if existing:
+            (
+                file_id,
+                existing_hash,
+                existing_modified,
+                existing_ns,
+                existing_size,
+            ) = existing
+
+            # Unchanged size and modification time: no need to hash
+            if _stat_matches(stat, existing_ns, existing_size, existing_modified):
+                return file_id
+
         file_hash = self._get_file_hash(file_path)
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        # BEGIN IMMEDIATE takes the write lock up front, so a concurrent writer
+        # waits on busy_timeout instead of failing with SQLITE_BUSY
+        with self.transaction() as conn:
+            if existing and existing_hash == file_hash:
+                # Touched but identical content: only refresh the stat
+                conn.execute(
+                    SQL_UPDATE_FILE_STAT,
+                    (file_size, last_modified, mtime_ns, file_id),
+                )
+                return file_id
 
-            # Check if file already exists
-            cursor.execute(
-                "SELECT id, file_hash, last_modified FROM files WHERE file_path = ?",
-                (file_path,),
+            # Insert a new record, or update the record of a changed file, in
+            # one statement
+            file_id = _upsert_file(
+                conn,
+                (
+                    file_path,
+                    file_hash,
+                    file_size,
+                    last_modified,
+                    mtime_ns,
+                    metadata.get("participant_id"),
+                    metadata.get("condition"),
+                    metadata.get("timepoint"),
+                    metadata.get("group"),
+                ),
             )
-            existing = cursor.fetchone()
 
             if existing:
-                file_id, existing_hash, existing_modified = existing
-
-                # Check if file has changed
-                if existing_hash != file_hash or existing_modified != last_modified:
-                    # File has changed, update record
-                    cursor.execute(
-                        """
-                        UPDATE files SET 
-                        file_hash = ?, file_size = ?, last_modified = ?,
-                        participant_id = ?, condition = ?, timepoint = ?, group_info = ?,
-                        updated_at = CURRENT_TIMESTAMP
-                        WHERE id = ?
-                    """,
-                        (
-                            file_hash,
-                            file_size,
-                            last_modified,
-                            metadata.get("participant_id"),
-                            metadata.get("condition"),
-                            metadata.get("timepoint"),
-                            metadata.get("group"),
-                            file_id,
-                        ),
-                    )
+                # Clear old analysis results since file changed
+                conn.execute(SQL_DELETE_FILE_RESULTS, (file_id,))
+                logger.debug("Updated file record: %s", file_path)
+            else:
+                logger.debug("Registered new file: %s", file_path)
+            return file_id
 
-                    # Clear old analysis results since file changed
-                    cursor.execute(
-                        "DELETE FROM analysis_results WHERE file_id = ?", (file_id,)
-                    )
-                    print(f"Updated file record: {file_path}")
+    def register_files_bulk(self, items: List[Tuple[str, Dict]]) -> Dict[str, int]:
+        """
+        Register many files at once with the same semantics as register_file
 
-                return file_id
+        Existing rows are looked up with batched queries. Only new files and
+        files whose size or modification time changed are hashed, concurrently
+        on a thread pool. New and changed files are then written with a single
+        executemany UPSERT in one BEGIN IMMEDIATE transaction, instead of one
+        round of statements per file.
+
+        Args:
+            items (list): List of (file_path, metadata) tuples
+
+        Returns:
+            dict: Mapping of absolute file path to file ID in the database.
+                Files that do not exist on disk are skipped.
+        """
+        found = []
+        for file_path, metadata in items:
+            file_path = _abspath(file_path)
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                logger.warning("Skipping missing file: %s", file_path)
+                continue
+            found.append((file_path, stat, metadata))
+
+        if not found:
+            return {}
+
+        # Look up the files that are already registered
+        existing = {}
+        with self._connection() as conn:
+            for placeholders, chunk in _in_clauses([path for path, _, _ in found]):
+                for row in conn.execute(
+                    SQL_SELECT_FILE_STATES_IN.format(placeholders=placeholders), chunk
+                ):
+                    existing[row[0]] = row[1:]
+
+        # Files with unchanged size and modification time need no hashing
+        to_hash = [
+            (file_path, stat, metadata)
+            for file_path, stat, metadata in found
+            if file_path not in existing
+            or not _stat_matches(stat, *existing[file_path][2:])
+        ]
+
+        # Hashing reads every file in full; hashlib releases the GIL while
+        # digesting, so the reads and digests overlap across threads
+        with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+            hashes = list(
+                executor.map(self._get_file_hash, [path for path, _, _ in to_hash])
+            )
+
+        new_rows, changed_rows, touched_rows, changed_ids = [], [], [], []
+        for (file_path, stat, metadata), file_hash in zip(to_hash, hashes):
+            row = (
+                file_path,
+                file_hash,
+                stat.st_size,
+                stat.st_mtime,
+                stat.st_mtime_ns,
+                metadata.get("participant_id"),
+                metadata.get("condition"),
+                metadata.get("timepoint"),
+                metadata.get("group"),
+            )
+            if file_path not in existing:
+                new_rows.append(row)
+            elif existing[file_path][1] != file_hash:
+                changed_rows.append(row)
+                changed_ids.append(existing[file_path][0])
             else:
-                # Insert new file record
-                cursor.execute(
-                    """
-                    INSERT INTO files (file_path, file_hash, file_size, last_modified,
-                                     participant_id, condition, timepoint, group_info)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+                # Touched but identical content: only refresh the stat
+                touched_rows.append(
                     (
-                        file_path,
-                        file_hash,
-                        file_size,
-                        last_modified,
-                        metadata.get("participant_id"),
-                        metadata.get("condition"),
-                        metadata.get("timepoint"),
-                        metadata.get("group"),
-                    ),
+                        stat.st_size,
+                        stat.st_mtime,
+                        stat.st_mtime_ns,
+                        existing[file_path][0],
+                    )
                 )
 
-                file_id = cursor.lastrowid
-                print(f"Registered new file: {file_path}")
-                return file_id
+        with self.transaction() as conn:
+            # Insert new files and update changed ones in one statement
+            conn.executemany(SQL_UPSERT_FILE, new_rows + changed_rows)
+            conn.executemany(SQL_UPDATE_FILE_STAT, touched_rows)
+
+            # Clear old analysis results since the files changed
+            for placeholders, chunk in _in_clauses(changed_ids):
+                conn.execute(
+                    SQL_DELETE_RESULTS_IN.format(placeholders=placeholders), chunk
+                )
+
+            file_ids = {path: ids[0] for path, ids in existing.items()}
+            for placeholders, chunk in _in_clauses([row[0] for row in new_rows]):
+                file_ids.update(
+                    conn.execute(
+                        SQL_SELECT_FILE_IDS_IN.format(placeholders=placeholders), chunk
+                    ).fetchall()
+                )
+
+        logger.info(
+            "Registered %d new files, updated %d changed files",
+            len(new_rows),
+            len(changed_rows),
+        )
+        return file_ids
 
     def get_file_metadata(self, file_path: str) -> Optional[Dict]:
         """
@@ -202,19 +954,10 @@ class DatabaseService:
         Returns:
             dict or None: Cached metadata if available
         """
-        file_path = os.path.abspath(file_path)
+        file_path = _abspath(file_path)
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT participant_id, condition, timepoint, group_info 
-                FROM files WHERE file_path = ?
-            """,
-                (file_path,),
-            )
-
-            result = cursor.fetchone()
+        with self._connection() as conn:
+            result = conn.execute(SQL_GET_META, (file_path,)).fetchone()
             if result:
                 return {
                     "participant_id": result[0],
@@ -228,7 +971,7 @@ class DatabaseService:
         self,
         file_path: str,
         analysis_type: str,
-        connectivity_matrix: pd.DataFrame,
+        connectivity_matrix: "pd.DataFrame",
         global_metrics: Dict = None,
         analysis_params: Dict = None,
     ):
@@ -242,45 +985,51 @@ class DatabaseService:
             global_metrics (dict): Global analysis metrics
             analysis_params (dict): Parameters used for analysis
         """
-        file_path = os.path.abspath(file_path)
-
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        file_path = _abspath(file_path)
 
+        # Write lock up front, as in register_file
+        with self.transaction() as conn:
             # Get file ID
-            cursor.execute("SELECT id FROM files WHERE file_path = ?", (file_path,))
-            result = cursor.fetchone()
+            result = conn.execute(SQL_SELECT_FILE_ID, (file_path,)).fetchone()
             if not result:
                 raise ValueError(f"File not registered: {file_path}")
 
             file_id = result[0]
 
+            # Rows registered before mtime_ns was recorded get it filled in
+            conn.execute(SQL_FILL_MTIME_NS, (os.stat(file_path).st_mtime_ns, file_id))
+
             # Serialize data
-            matrix_json = connectivity_matrix.to_json(orient="index")
-            electrode_list = json.dumps(list(connectivity_matrix.index))
+            (
+                matrix_blob,
+                matrix_rows,
+                matrix_cols,
+                matrix_dtype,
+                electrode_list,
+                matrix_columns,
+                matrix_codec,
+            ) = _serialize_matrix(connectivity_matrix)
             metrics_json = json.dumps(global_metrics) if global_metrics else None
             params_json = json.dumps(analysis_params) if analysis_params else None
 
             # Insert or update analysis result
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO analysis_results 
-                (file_id, analysis_type, connectivity_matrix, global_metrics, 
-                 electrode_list, analysis_params)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """,
+            conn.execute(
+                SQL_INSERT_ANALYSIS,
                 (
                     file_id,
                     analysis_type,
-                    matrix_json,
                     metrics_json,
                     electrode_list,
                     params_json,
+                    matrix_blob,
+                    matrix_rows,
+                    matrix_cols,
+                    matrix_dtype,
+                    matrix_columns,
+                    matrix_codec,
                 ),
             )
-
-            conn.commit()
-            print(f"Cached analysis result for: {file_path}")
+            logger.debug("Cached analysis result for: %s", file_path)
 
     def get_cached_analysis(self, file_path: str, analysis_type: str) -> Optional[Dict]:
         """
@@ -293,36 +1042,48 @@ class DatabaseService:
         Returns:
             dict or None: Cached analysis results if available
         """
-        file_path = os.path.abspath(file_path)
-
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT ar.connectivity_matrix, ar.global_metrics, ar.electrode_list, ar.analysis_params
-                FROM analysis_results ar
-                JOIN files f ON ar.file_id = f.id
-                WHERE f.file_path = ? AND ar.analysis_type = ?
-            """,
-                (file_path, analysis_type),
-            )
+        file_path = _abspath(file_path)
 
-            result = cursor.fetchone()
+        with self._connection() as conn:
+            result = conn.execute(
+                SQL_SELECT_ANALYSIS, (file_path, analysis_type)
+            ).fetchone()
             if result:
-                matrix_json, metrics_json, electrode_json, params_json = result
+                return _analysis_from_row(result)
+            return None
+
+    def get_cached_bundle(
+        self, file_path: str, analysis_type: str = "granger_causality"
+    ) -> Optional[Dict]:
+        """
+        Retrieve a file's metadata together with its cached analysis
 
-                # Deserialize data
-                connectivity_matrix = pd.read_json(matrix_json, orient="index")
-                electrode_list = json.loads(electrode_json)
-                global_metrics = json.loads(metrics_json) if metrics_json else {}
-                analysis_params = json.loads(params_json) if params_json else {}
+        Equivalent to get_file_metadata plus get_cached_analysis, but served
+        by a single JOINed query.
 
-                return {
-                    "connectivity_matrix": connectivity_matrix,
-                    "global_metrics": global_metrics,
-                    "electrode_list": electrode_list,
-                    "analysis_params": analysis_params,
+        Args:
+            file_path (str): Path to the file
+            analysis_type (str): Type of analysis
+
+        Returns:
+            dict or None: The get_cached_analysis result with an extra
+                "metadata" entry, or None if no cached analysis exists
+        """
+        file_path = _abspath(file_path)
+
+        with self._connection() as conn:
+            result = conn.execute(
+                SQL_SELECT_BUNDLE, (file_path, analysis_type)
+            ).fetchone()
+            if result:
+                bundle = _analysis_from_row(result[:10])
+                bundle["metadata"] = {
+                    "participant_id": result[10],
+                    "condition": result[11],
+                    "timepoint": result[12],
+                    "group": result[13] or "",
                 }
+                return bundle
             return None
 
     def is_file_cached(
@@ -338,37 +1099,100 @@ class DatabaseService:
         Returns:
             bool: True if cached results exist and file hasn't changed
         """
-        file_path = os.path.abspath(file_path)
+        file_path = _abspath(file_path)
 
-        if not os.path.exists(file_path):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
             return False
 
-        # Check if file has changed since caching
-        current_hash = self._get_file_hash(file_path)
-        current_modified = os.path.getmtime(file_path)
+        with self._connection() as conn:
+            result = conn.execute(
+                SQL_CHECK_CACHED,
+                (
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                    stat.st_mtime,
+                    analysis_type,
+                    file_path,
+                ),
+            ).fetchone()
+            if result is None or result[0]:
+                return result is not None
+
+            # Stat changed: only now hash the file and compare it in SQL
+            result = conn.execute(
+                SQL_CHECK_CACHED_HASH,
+                (analysis_type, file_path, self._get_file_hash(file_path)),
+            ).fetchone()
+        return bool(result[0])
+
+    def get_cached_paths(
+        self, file_paths: List[str], analysis_type: str = "granger_causality"
+    ) -> Set[str]:
+        """
+        Batch version of is_file_cached for many files at once
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT f.file_hash, f.last_modified, ar.id
-                FROM files f
-                LEFT JOIN analysis_results ar ON f.id = ar.file_id AND ar.analysis_type = ?
-                WHERE f.file_path = ?
-            """,
-                (analysis_type, file_path),
-            )
+        The cache rows for all files are fetched with one IN (...) query per
+        chunk instead of one query per file.
 
-            result = cursor.fetchone()
-            if result:
-                cached_hash, cached_modified, analysis_id = result
-                # File is cached if analysis exists and file hasn't changed
-                return (
-                    analysis_id is not None
-                    and cached_hash == current_hash
-                    and cached_modified == current_modified
-                )
-            return False
+        Args:
+            file_paths (list): Paths of the files to check
+            analysis_type (str): Type of analysis to check
+
+        Returns:
+            set: Absolute paths of the files with valid cached results
+        """
+        abs_paths = [_abspath(p) for p in file_paths]
+        rows = {}
+
+        with self._connection() as conn:
+            for placeholders, chunk in _in_clauses(abs_paths):
+                for row in conn.execute(
+                    SQL_CHECK_CACHED_IN.format(placeholders=placeholders),
+                    (analysis_type, *chunk),
+                ):
+                    rows[row[0]] = row[1:]
+
+        cached_paths = set()
+        for file_path, cached in rows.items():
+            # File is cached only if it hasn't changed since caching
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            if self._is_unchanged(file_path, stat, cached):
+                cached_paths.add(file_path)
+
+        return cached_paths
+
+    def get_files_metadata(self, file_paths: List[str]) -> Dict[str, Dict]:
+        """
+        Batch version of get_file_metadata for many files at once
+
+        Args:
+            file_paths (list): Paths of the files to look up
+
+        Returns:
+            dict: Mapping of absolute file path to cached metadata, for the
+                files that are registered
+        """
+        abs_paths = [_abspath(p) for p in file_paths]
+        metadata_by_path = {}
+
+        with self._connection() as conn:
+            for placeholders, chunk in _in_clauses(abs_paths):
+                for row in conn.execute(
+                    SQL_GET_META_IN.format(placeholders=placeholders), chunk
+                ):
+                    metadata_by_path[row[0]] = {
+                        "participant_id": row[1],
+                        "condition": row[2],
+                        "timepoint": row[3],
+                        "group": row[4] or "",
+                    }
+
+        return metadata_by_path
 
     def get_all_files(
         self, condition: str = None, participant_id: str = None
@@ -383,7 +1207,7 @@ class DatabaseService:
         Returns:
             list: List of file records
         """
-        query = "SELECT * FROM files WHERE 1=1"
+        query = f"SELECT {', '.join(FILE_RECORD_COLUMNS)} FROM files WHERE 1=1"
         params = []
 
         if condition:
@@ -396,51 +1220,48 @@ class DatabaseService:
 
         query += " ORDER BY participant_id, condition, timepoint"
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-
-            columns = [desc[0] for desc in cursor.description]
-            results = []
-
-            for row in cursor.fetchall():
-                results.append(dict(zip(columns, row)))
+        with self._connection() as conn:
+            rows = conn.execute(query, params).fetchall()
 
-            return results
+        return [dict(zip(FILE_RECORD_COLUMNS, row)) for row in rows]
 
     def cleanup_orphaned_records(self):
         """Remove records for files that no longer exist"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            # Get all file paths
-            cursor.execute("SELECT id, file_path FROM files")
-            files = cursor.fetchall()
-
-            orphaned_ids = []
-            for file_id, file_path in files:
-                if not os.path.exists(file_path):
-                    orphaned_ids.append(file_id)
-
-            if orphaned_ids:
-                # Remove orphaned analysis results
-                cursor.execute(
-                    f'DELETE FROM analysis_results WHERE file_id IN ({",".join("?" * len(orphaned_ids))})',
-                    orphaned_ids,
+        with self.transaction() as conn:
+            files = conn.execute("SELECT id, file_path FROM files").fetchall()
+
+            # Check the files concurrently; each check is a blocking syscall
+            with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+                exists = executor.map(os.path.exists, [path for _, path in files])
+
+            conn.execute(SQL_CREATE_ALIVE)
+            try:
+                conn.executemany(
+                    SQL_INSERT_ALIVE,
+                    [(file_id,) for (file_id, _), found in zip(files, exists) if found],
                 )
+                # New databases cascade this from files, but ones created
+                # before ON DELETE CASCADE was added still need it explicitly
+                conn.execute(SQL_DELETE_DEAD_RESULTS)
+                orphaned = conn.execute(SQL_DELETE_DEAD_FILES).rowcount
+            finally:
+                conn.execute(SQL_DROP_ALIVE)
 
-                # Remove orphaned file records
-                cursor.execute(
-                    f'DELETE FROM files WHERE id IN ({",".join("?" * len(orphaned_ids))})',
-                    orphaned_ids,
-                )
+            if orphaned:
+                logger.info("Cleaned up %d orphaned records", orphaned)
 
-                conn.commit()
-                print(f"Cleaned up {len(orphaned_ids)} orphaned records")
+    def analyze(self):
+        """
+        Refresh the statistics the SQLite query planner uses to pick indexes
+
+        Worth calling after bulk writes, once the tables have grown noticeably.
+        """
+        with self._connection() as conn:
+            conn.execute("ANALYZE")
 
     def get_database_stats(self) -> Dict:
         """Get database statistics"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
 
             # Count files and analyses
@@ -479,5 +1300,5 @@ def get_database_service(db_path: str = "granger_cache.db") -> DatabaseService:
 def init_database(db_path: str = "granger_cache.db") -> DatabaseService:
     """Initialize database and return service instance"""
     service = DatabaseService(db_path)
-    print(f"Database initialized: {db_path}")
+    logger.info("Database initialized: %s", db_path)
     return service
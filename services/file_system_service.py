@@ -5,58 +5,68 @@ File System Service for Granger Causality Analysis
 This service handles directory creation and file system operations.
 """
 
+import csv
+import logging
 import os
-import sys
+import shutil
 
+import numpy as np
 
-def create_matrix_output_directories(output_dir):
+logger = logging.getLogger(__name__)
+
+
+# Visualization subdirectory for each kind of processing
+OUTPUT_SUBDIRS = {
+    "matrix": "matrices",  # For connectivity matrix visualizations
+    "network": "networks",  # For network graph visualizations
+    "nodal": "nodals",  # For nodal metric visualizations
+    "pairwise": "pairwise",  # For pairwise connection visualizations
+    "global": "global",  # For global metric visualizations
+}
+
+# Subdirectories shared by every kind of processing
+COMMON_SUBDIRS = (
+    "individual",  # For individual participant analyses
+    "by_condition",  # Grouped by condition
+    "by_timepoint",  # Grouped by timepoint
+    "reports",  # For text reports/summaries
+)
+
+
+def create_output_directories(output_dir, kind):
     """
-    Create necessary output directories for matrix processing
+    Create necessary output directories for one kind of processing
+
+    makedirs creates output_dir itself along with the first subdirectory.
 
     Args:
         output_dir (str): Base output directory path
+        kind (str): One of the OUTPUT_SUBDIRS keys, e.g. "matrix"
     """
-    # Create main output directory
-    os.makedirs(output_dir, exist_ok=True)
-
-    # Create subdirectories for matrix processing
-    subdirs = [
-        "matrices",  # For connectivity matrix visualizations
-        "individual",  # For individual participant analyses
-        "by_condition",  # Grouped by condition
-        "by_timepoint",  # Grouped by timepoint
-        "reports",  # For text reports/summaries
-    ]
-
-    for subdir in subdirs:
+    for subdir in (OUTPUT_SUBDIRS[kind], *COMMON_SUBDIRS):
         os.makedirs(os.path.join(output_dir, subdir), exist_ok=True)
 
-    print(f"Created matrix output directories in: {output_dir}")
+    print(f"Created {kind} output directories in: {output_dir}")
 
 
-def create_network_output_directories(output_dir):
+def create_matrix_output_directories(output_dir):
     """
-    Create necessary output directories for network processing
+    Create necessary output directories for matrix processing
 
     Args:
         output_dir (str): Base output directory path
     """
-    # Create main output directory
-    os.makedirs(output_dir, exist_ok=True)
+    create_output_directories(output_dir, "matrix")
 
-    # Create subdirectories for network processing
-    subdirs = [
-        "networks",  # For network graph visualizations
-        "individual",  # For individual participant analyses
-        "by_condition",  # Grouped by condition
-        "by_timepoint",  # Grouped by timepoint
-        "reports",  # For text reports/summaries
-    ]
 
-    for subdir in subdirs:
-        os.makedirs(os.path.join(output_dir, subdir), exist_ok=True)
+def create_network_output_directories(output_dir):
+    """
+    Create necessary output directories for network processing
 
-    print(f"Created network output directories in: {output_dir}")
+    Args:
+        output_dir (str): Base output directory path
+    """
+    create_output_directories(output_dir, "network")
 
 
 def create_nodal_output_directories(output_dir):
@@ -66,22 +76,7 @@ def create_nodal_output_directories(output_dir):
     Args:
         output_dir (str): Base output directory path
     """
-    # Create main output directory
-    os.makedirs(output_dir, exist_ok=True)
-
-    # Create subdirectories for nodal processing
-    subdirs = [
-        "nodals",  # For nodal metric visualizations
-        "individual",  # For individual participant analyses
-        "by_condition",  # Grouped by condition
-        "by_timepoint",  # Grouped by timepoint
-        "reports",  # For text reports/summaries
-    ]
-
-    for subdir in subdirs:
-        os.makedirs(os.path.join(output_dir, subdir), exist_ok=True)
-
-    print(f"Created nodal output directories in: {output_dir}")
+    create_output_directories(output_dir, "nodal")
 
 
 def create_pairwise_output_directories(output_dir):
@@ -91,22 +86,7 @@ def create_pairwise_output_directories(output_dir):
     Args:
         output_dir (str): Base output directory path
     """
-    # Create main output directory
-    os.makedirs(output_dir, exist_ok=True)
-
-    # Create subdirectories for pairwise processing
-    subdirs = [
-        "pairwise",  # For pairwise connection visualizations
-        "individual",  # For individual participant analyses
-        "by_condition",  # Grouped by condition
-        "by_timepoint",  # Grouped by timepoint
-        "reports",  # For text reports/summaries
-    ]
-
-    for subdir in subdirs:
-        os.makedirs(os.path.join(output_dir, subdir), exist_ok=True)
-
-    print(f"Created pairwise output directories in: {output_dir}")
+    create_output_directories(output_dir, "pairwise")
 
 
 def create_global_output_directories(output_dir):
@@ -116,22 +96,7 @@ def create_global_output_directories(output_dir):
     Args:
         output_dir (str): Base output directory path
     """
-    # Create main output directory
-    os.makedirs(output_dir, exist_ok=True)
-
-    # Create subdirectories for global processing
-    subdirs = [
-        "global",  # For global metric visualizations
-        "individual",  # For individual participant analyses
-        "by_condition",  # Grouped by condition
-        "by_timepoint",  # Grouped by timepoint
-        "reports",  # For text reports/summaries
-    ]
-
-    for subdir in subdirs:
-        os.makedirs(os.path.join(output_dir, subdir), exist_ok=True)
-
-    print(f"Created global output directories in: {output_dir}")
+    create_output_directories(output_dir, "global")
 
 
 def validate_input_directory(input_dir):
@@ -145,10 +110,58 @@ def validate_input_directory(input_dir):
         bool: True if directory exists, False otherwise
     """
     if not os.path.exists(input_dir):
-        print(f"Error: Input directory '{input_dir}' does not exist.")
-        print(
-            f"Please create the '{input_dir}' directory and place your Excel files there."
+        logger.error(
+            "Error: Input directory '%s' does not exist.\n"
+            "Please create the '%s' directory and place your Excel files there.",
+            input_dir,
+            input_dir,
         )
         return False
 
     return True
+
+
+def copy_output_file(source, destination):
+    """
+    Place a copy of an output file at another path
+
+    The copy is a hard link where the file system allows it, and a byte copy
+    otherwise (e.g. across devices). An existing file at destination is replaced.
+
+    Args:
+        source (str): Path of the file to copy
+        destination (str): Path of the copy
+    """
+    try:
+        os.remove(destination)
+    except FileNotFoundError:
+        pass
+
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+def write_matrix_csv(values, labels, csv_path):
+    """
+    Write a labelled square matrix as CSV
+
+    The layout matches DataFrame.to_csv: a header row of labels after an empty
+    corner cell, then one row per label. Floats are written at full round-trip
+    precision and NaN as an empty cell. The rows go through the C csv writer
+    in one call instead of pandas' per-cell formatting.
+
+    Args:
+        values (numpy.ndarray): Matrix values, rows and columns in label order
+        labels (list): Row and column labels
+        csv_path (str): Output file path
+    """
+    rows = values.tolist()
+    if np.isnan(values).any():
+        rows = [["" if value != value else value for value in row] for row in rows]
+
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.writer(f, lineterminator=os.linesep)
+        writer.writerow(["", *labels])
+        writer.writerows([label, *row] for label, row in zip(labels, rows))
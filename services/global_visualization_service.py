@@ -7,8 +7,137 @@ with consistent scaling to prevent visual distortions.
 """
 
 import os
+from collections import defaultdict
+from functools import lru_cache
+
 import numpy as np
 from visualize_global import plot_global_metrics
+from .parallel_render_service import render_in_parallel
+from .scale_service import padded_scale
+
+
+# Kinds of global metric that get their own scale
+STRENGTH, DENSITY = 0, 1
+
+
+@lru_cache(maxsize=None)
+def _classify_metric(name):
+    """Return STRENGTH or DENSITY for a metric name, or None for other metrics
+
+    Memoized, since the same few metric names recur in every analysis.
+    """
+    lowered = name.lower()
+    if "strength" in lowered:
+        return STRENGTH
+    if "density" in lowered:
+        return DENSITY
+    return None
+
+
+def _iter_scale_metrics(global_data):
+    """Yield (kind, value) for every strength or density metric in global_data
+
+    Args:
+        global_data: Global metrics of one analysis, either nested
+            ({category: {metric: value}}), flat ({metric: value}) or a single value
+
+    Yields:
+        (STRENGTH or DENSITY, value) tuples
+    """
+    if isinstance(global_data, dict):
+        # Separate strength and density metrics
+        for key, value in global_data.items():
+            if isinstance(value, dict):
+                for metric_name, metric_value in value.items():
+                    kind = _classify_metric(metric_name)
+                    if kind is not None:
+                        yield kind, metric_value
+            else:
+                # Check if the key itself indicates the type
+                kind = _classify_metric(key)
+                if kind is not None:
+                    yield kind, value
+    else:
+        # Single value - assume it's a strength metric
+        yield STRENGTH, global_data
+
+
+def _split_scale_metrics(global_datas):
+    """Collect the strength and density values of several analyses into arrays
+
+    Args:
+        global_datas: Iterable of global metrics, as accepted by _iter_scale_metrics
+
+    Returns:
+        Tuple of (strength_values, density_values) float64 arrays
+    """
+    pairs = [pair for data in global_datas for pair in _iter_scale_metrics(data)]
+    kinds = np.fromiter((kind for kind, _ in pairs), dtype=np.int8, count=len(pairs))
+    values = np.fromiter(
+        (value for _, value in pairs), dtype=np.float64, count=len(pairs)
+    )
+    return values[kinds == STRENGTH], values[kinds == DENSITY]
+
+
+def _average_global_metrics(template, global_datas):
+    """Average dict-shaped global metrics across analyses, column by column
+
+    The analyses are walked once, flattening every metric into a column keyed
+    by (category, metric_name), or (metric_name, None) for values that are
+    not nested. The columns are then averaged as float64 arrays. Analyses
+    missing a metric are left out of that metric's average.
+
+    Args:
+        template: Global metrics of the first analysis, which decide the
+            categories and metrics (and their order) in the result
+        global_datas: Global metrics of every analysis to average
+
+    Returns:
+        Averaged metrics with the same nesting as the template
+    """
+    columns = defaultdict(list)
+    for global_data in global_datas:
+        for category, metrics in global_data.items():
+            if isinstance(metrics, dict):
+                for metric_name, value in metrics.items():
+                    columns[category, metric_name].append(value)
+            else:
+                columns[category, None].append(metrics)
+
+    # Columns the result needs, in template order
+    needed = []
+    for category, metrics in template.items():
+        if isinstance(metrics, dict):
+            needed.extend(
+                (category, metric_name)
+                for metric_name in metrics
+                if (category, metric_name) in columns
+            )
+        elif (category, None) in columns:
+            needed.append((category, None))
+
+    # Metrics every analysis has form one (metrics x analyses) block that is
+    # averaged in a single call; only ragged columns are averaged one by one
+    full = [key for key in needed if len(columns[key]) == len(global_datas)]
+    means = {}
+    if full:
+        block = np.array([columns[key] for key in full], dtype=np.float64)
+        means.update(zip(full, block.mean(axis=1)))
+    for key in needed:
+        if key not in means:
+            means[key] = np.asarray(columns[key], dtype=np.float64).mean()
+
+    averaged_global = {}
+    for category, metrics in template.items():
+        if isinstance(metrics, dict):
+            averaged_global[category] = {
+                metric_name: means[category, metric_name]
+                for metric_name in metrics
+                if (category, metric_name) in means
+            }
+        elif (category, None) in means:
+            averaged_global[category] = means[category, None]
+    return averaged_global
 
 
 def calculate_global_scales_per_participant(analyses_by_participant):
@@ -26,62 +155,33 @@ def calculate_global_scales_per_participant(analyses_by_participant):
         if not analyses:
             continue
 
-        # Collect strength and density metrics separately
-        strength_values = []
-        density_values = []
-
-        for analysis_key, analysis in analyses:
-            global_data = analysis["global"]
-            if isinstance(global_data, dict):
-                # Separate strength and density metrics
-                for key, value in global_data.items():
-                    if isinstance(value, dict):
-                        for metric_name, metric_value in value.items():
-                            if "strength" in metric_name.lower():
-                                strength_values.append(metric_value)
-                            elif "density" in metric_name.lower():
-                                density_values.append(metric_value)
-                    else:
-                        # Check if the key itself indicates the type
-                        if "strength" in key.lower():
-                            strength_values.append(value)
-                        elif "density" in key.lower():
-                            density_values.append(value)
-            else:
-                # Single value - assume it's a strength metric
-                strength_values.append(global_data)
+        # Collect strength and density metrics separately, in one pass
+        strength_values, density_values = _split_scale_metrics(
+            analysis["global"] for analysis_key, analysis in analyses
+        )
 
         participant_scales[participant_id] = {}
 
         # Calculate strength scale
-        if strength_values:
-            strength_min, strength_max = min(strength_values), max(strength_values)
-            strength_range = strength_max - strength_min
-            strength_padding = strength_range * 0.05 if strength_range > 0 else 0.0001
-            participant_scales[participant_id]["strength"] = (
-                strength_min - strength_padding,
-                strength_max + strength_padding,
+        if strength_values.size:
+            participant_scales[participant_id]["strength"] = padded_scale(
+                strength_values
             )
 
         # Calculate density scale
-        if density_values:
-            density_min, density_max = min(density_values), max(density_values)
-            density_range = density_max - density_min
-            density_padding = density_range * 0.05 if density_range > 0 else 0.0001
-            participant_scales[participant_id]["density"] = (
-                density_min - density_padding,
-                density_max + density_padding,
-            )
+        if density_values.size:
+            participant_scales[participant_id]["density"] = padded_scale(density_values)
 
     return participant_scales
 
 
-def generate_individual_global_visualizations(analyzer, output_dir):
+def generate_individual_global_visualizations(analyzer, output_dir, max_workers=None):
     """Generate individual global metric visualizations with consistent scaling per participant
 
     Args:
         analyzer: GrangerCausalityAnalyzer instance with loaded analyses
         output_dir: Base output directory
+        max_workers: Maximum number of rendering processes (default: os.cpu_count())
     """
     from .data_loader_service import group_analyses_by_participant
 
@@ -95,6 +195,8 @@ def generate_individual_global_visualizations(analyzer, output_dir):
 
     # Generate individual visualizations
     global_dir = os.path.join(output_dir, "global")
+    jobs = []
+    generated = []
 
     for key, analysis in analyzer.analyses.items():
         participant_id = analysis["metadata"]["participant_id"]
@@ -114,15 +216,18 @@ def generate_individual_global_visualizations(analyzer, output_dir):
 
         output_path = os.path.join(global_dir, f"{base_name}_global.png")
 
-        plot_global_metrics(
-            analysis["global"],
-            title,
-            output_path,
-            strength_scale=strength_scale,
-            density_scale=density_scale,
+        jobs.append(
+            (
+                (analysis["global"], title, output_path),
+                {"strength_scale": strength_scale, "density_scale": density_scale},
+            )
         )
+        generated.append(f"{base_name}_global.png")
+
+    render_in_parallel(plot_global_metrics, jobs, max_workers)
 
-        print(f"  Generated: {base_name}_global.png")
+    for filename in generated:
+        print(f"  Generated: {filename}")
 
 
 def generate_condition_level_global_visualizations(analyzer, output_dir):
@@ -149,114 +254,34 @@ def generate_condition_level_global_visualizations(analyzer, output_dir):
             continue
 
         first_global = first_analysis["global"]
+        global_datas = [
+            analysis["global"]
+            for analysis_key, analysis in analyses
+            if "global" in analysis
+        ]
 
-        # Initialize structure for averaging
         if isinstance(first_global, dict):
-            # Check if nested structure
-            any_dict_values = any(
-                isinstance(value, dict) for value in first_global.values()
-            )
-
-            if any_dict_values:
-                # Nested structure: Category -> Metrics -> Values
-                averaged_global = {}
-                for category, metrics in first_global.items():
-                    if isinstance(metrics, dict):
-                        averaged_global[category] = {}
-                        for metric_name in metrics.keys():
-                            # Collect values for this metric across all analyses
-                            metric_values = []
-                            for analysis_key, analysis in analyses:
-                                if (
-                                    "global" in analysis
-                                    and category in analysis["global"]
-                                    and isinstance(analysis["global"][category], dict)
-                                    and metric_name in analysis["global"][category]
-                                ):
-                                    metric_values.append(
-                                        analysis["global"][category][metric_name]
-                                    )
-
-                            if metric_values:
-                                averaged_global[category][metric_name] = np.mean(
-                                    metric_values
-                                )
-                    else:
-                        # Handle case where category value is not a dict
-                        metric_values = []
-                        for analysis_key, analysis in analyses:
-                            if "global" in analysis and category in analysis["global"]:
-                                metric_values.append(analysis["global"][category])
-
-                        if metric_values:
-                            averaged_global[category] = np.mean(metric_values)
-            else:
-                # Flat structure: Metric -> Value
-                averaged_global = {}
-                for metric_name in first_global.keys():
-                    metric_values = []
-                    for analysis_key, analysis in analyses:
-                        if "global" in analysis and metric_name in analysis["global"]:
-                            metric_values.append(analysis["global"][metric_name])
-
-                    if metric_values:
-                        averaged_global[metric_name] = np.mean(metric_values)
+            averaged_global = _average_global_metrics(first_global, global_datas)
         else:
             # Single value structure
-            metric_values = []
-            for analysis_key, analysis in analyses:
-                if "global" in analysis:
-                    metric_values.append(analysis["global"])
-
-            if metric_values:
-                averaged_global = np.mean(metric_values)
-            else:
-                averaged_global = {}
+            averaged_global = np.mean(global_datas) if global_datas else {}
 
         condition_averages[condition] = averaged_global
 
     # Calculate separate global scales for strength and density metrics
-    all_strength_values = []
-    all_density_values = []
-
-    for condition_global in condition_averages.values():
-        if isinstance(condition_global, dict):
-            # Separate strength and density metrics
-            for key, value in condition_global.items():
-                if isinstance(value, dict):
-                    for metric_name, metric_value in value.items():
-                        if "strength" in metric_name.lower():
-                            all_strength_values.append(metric_value)
-                        elif "density" in metric_name.lower():
-                            all_density_values.append(metric_value)
-                else:
-                    # Check if the key itself indicates the type
-                    if "strength" in key.lower():
-                        all_strength_values.append(value)
-                    elif "density" in key.lower():
-                        all_density_values.append(value)
-        else:
-            # Single value - assume it's a strength metric
-            all_strength_values.append(condition_global)
+    all_strength_values, all_density_values = _split_scale_metrics(
+        condition_averages.values()
+    )
 
     # Calculate strength scale
     strength_scale = None
-    if all_strength_values:
-        strength_min, strength_max = min(all_strength_values), max(all_strength_values)
-        strength_range = strength_max - strength_min
-        strength_padding = strength_range * 0.05 if strength_range > 0 else 0.0001
-        strength_scale = (
-            strength_min - strength_padding,
-            strength_max + strength_padding,
-        )
+    if all_strength_values.size:
+        strength_scale = padded_scale(all_strength_values)
 
     # Calculate density scale
     density_scale = None
-    if all_density_values:
-        density_min, density_max = min(all_density_values), max(all_density_values)
-        density_range = density_max - density_min
-        density_padding = density_range * 0.05 if density_range > 0 else 0.0001
-        density_scale = (density_min - density_padding, density_max + density_padding)
+    if all_density_values.size:
+        density_scale = padded_scale(all_density_values)
 
         # Generate condition-level visualizations
         by_condition_dir = os.path.join(output_dir, "by_condition")
@@ -7,8 +7,9 @@ allowing the GUI to quickly populate file lists, get metadata, and load cached a
 """
 
 import os
+from collections import defaultdict
 from typing import Dict, List, Optional, Tuple
-from .cached_data_loader_service import CachedDataLoaderService
+from .cached_data_loader_service import CachedDataLoaderService, LoadResult
 from .database_service import DatabaseService
 from granger_analysis import GrangerCausalityAnalyzer
 
@@ -35,41 +36,51 @@ class GUIIntegrationService:
         """
         return self.db_service.get_all_files()
 
-    def get_files_by_participant(self) -> Dict[str, List[Dict]]:
+    def get_files_by_participant(
+        self, files: Optional[List[Dict]] = None
+    ) -> Dict[str, List[Dict]]:
         """
         Get files organized by participant ID
 
+        Args:
+            files (list, optional): File records already fetched with
+                get_available_files, to avoid querying them again
+
         Returns:
             dict: Dictionary mapping participant_id to list of file records
         """
-        files = self.get_available_files()
-        participants = {}
+        if files is None:
+            files = self.get_available_files()
+        participants = defaultdict(list)
 
         for file_record in files:
             pid = file_record["participant_id"]
             if pid and pid != "unknown":
-                if pid not in participants:
-                    participants[pid] = []
                 participants[pid].append(file_record)
 
         # Sort participants by ID
         return dict(sorted(participants.items(), key=lambda x: x[0]))
 
-    def get_files_by_condition(self) -> Dict[str, List[Dict]]:
+    def get_files_by_condition(
+        self, files: Optional[List[Dict]] = None
+    ) -> Dict[str, List[Dict]]:
         """
         Get files organized by condition
 
+        Args:
+            files (list, optional): File records already fetched with
+                get_available_files, to avoid querying them again
+
         Returns:
             dict: Dictionary mapping condition to list of file records
         """
-        files = self.get_available_files()
-        conditions = {}
+        if files is None:
+            files = self.get_available_files()
+        conditions = defaultdict(list)
 
         for file_record in files:
             condition = file_record["condition"]
             if condition and condition != "unknown":
-                if condition not in conditions:
-                    conditions[condition] = []
                 conditions[condition].append(file_record)
 
         # Sort conditions alphabetically
@@ -93,33 +104,52 @@ class GUIIntegrationService:
             if condition and condition != "unknown":
                 conditions.add(condition)
 
-        return sorted(list(conditions))
+        return sorted(conditions)
 
-    def get_file_summary_stats(self) -> Dict:
+    def get_file_summary_stats(self, files: Optional[List[Dict]] = None) -> Dict:
         """
         Get summary statistics about cached files
 
+        Args:
+            files (list, optional): File records already fetched with
+                get_available_files, to avoid querying them again
+
         Returns:
             dict: Summary statistics
         """
         stats = self.db_service.get_database_stats()
-        files = self.get_available_files()
+        if files is None:
+            files = self.get_available_files()
+
+        if not files:
+            return {
+                "total_files": stats["total_files"],
+                "cached_analyses": stats["cached_analyses"],
+                "unique_participants": 0,
+                "unique_conditions": 0,
+                "unique_timepoints": 0,
+                "participant_list": [],
+                "condition_list": [],
+                "timepoint_list": [],
+            }
 
-        # Additional GUI-friendly stats
+        # Additional GUI-friendly stats, collected in a single pass
         participants = set()
         conditions = set()
         timepoints = set()
 
         for file_record in files:
-            if (
-                file_record["participant_id"]
-                and file_record["participant_id"] != "unknown"
-            ):
-                participants.add(file_record["participant_id"])
-            if file_record["condition"] and file_record["condition"] != "unknown":
-                conditions.add(file_record["condition"])
-            if file_record["timepoint"] and file_record["timepoint"] != "unknown":
-                timepoints.add(file_record["timepoint"])
+            pid, condition, timepoint = (
+                file_record["participant_id"],
+                file_record["condition"],
+                file_record["timepoint"],
+            )
+            if pid and pid != "unknown":
+                participants.add(pid)
+            if condition and condition != "unknown":
+                conditions.add(condition)
+            if timepoint and timepoint != "unknown":
+                timepoints.add(timepoint)
 
         return {
             "total_files": stats["total_files"],
@@ -127,9 +157,9 @@ class GUIIntegrationService:
             "unique_participants": len(participants),
             "unique_conditions": len(conditions),
             "unique_timepoints": len(timepoints),
-            "participant_list": sorted(list(participants)),
-            "condition_list": sorted(list(conditions)),
-            "timepoint_list": sorted(list(timepoints)),
+            "participant_list": sorted(participants),
+            "condition_list": sorted(conditions),
+            "timepoint_list": sorted(timepoints),
         }
 
     def load_selected_files(
@@ -149,28 +179,35 @@ class GUIIntegrationService:
         # Since it expects to find files in a directory
         analyzer = GrangerCausalityAnalyzer()
 
-        successful_loads = 0
         failed_loads = 0
-
+        existing_paths = []
         for file_path in file_paths:
             if os.path.exists(file_path):
-                if self.cached_loader.load_single_file_with_cache(
-                    analyzer, file_path, force_reload
-                ):
-                    successful_loads += 1
-                else:
-                    failed_loads += 1
+                existing_paths.append(file_path)
             else:
                 print(f"File not found: {file_path}")
                 failed_loads += 1
 
+        # One batched cache lookup serves both the loads and the analysis check
+        cached_paths = (
+            set() if force_reload else self.db_service.get_cached_paths(existing_paths)
+        )
+
+        # Load the files concurrently; results are merged in selection order
+        results = self.cached_loader.load_files_parallel(
+            analyzer, existing_paths, force_reload, cached_paths
+        )
+        successful_loads = sum(1 for loaded in results if loaded)
+        failed_loads += len(results) - successful_loads
+
         # Run analysis if needed
         if successful_loads > 0:
-            # Check if any files need analysis
+            # Files loaded fresh need analysis, including indexed files whose
+            # cache entry could not be used
             uncached_files = [
                 f
-                for f in file_paths
-                if not self.db_service.is_file_cached(f) or force_reload
+                for f, result in zip(existing_paths, results)
+                if result is LoadResult.FRESH
             ]
 
             if uncached_files:
@@ -216,20 +253,16 @@ class GUIIntegrationService:
             directory_path (str): Directory to scan
 
         Returns:
-            list: List of new file paths found
+            list: Absolute paths of the new files found
         """
         from .data_loader_service import find_input_files
 
-        all_files = find_input_files(directory_path)
+        # Listing the absolute directory yields absolute, normalized paths in
+        # the form the database stores, so no per-file abspath is needed
+        all_files = find_input_files(os.path.abspath(directory_path))
         cached_files = {f["file_path"] for f in self.get_available_files()}
 
-        new_files = []
-        for file_path in all_files:
-            abs_path = os.path.abspath(file_path)
-            if abs_path not in cached_files:
-                new_files.append(file_path)
-
-        return new_files
+        return [file_path for file_path in all_files if file_path not in cached_files]
 
     def add_files_to_cache(self, file_paths: List[str]) -> Tuple[int, int]:
         """
@@ -261,24 +294,37 @@ class GUIIntegrationService:
 
         return successful_adds, failed_adds
 
-    def get_gui_file_tree_data(self) -> Dict:
+    def get_gui_file_tree_data(self, files: Optional[List[Dict]] = None) -> Dict:
         """
         Get data structured for GUI tree/list views
 
+        Args:
+            files (list, optional): File records already fetched with
+                get_available_files, to avoid querying them again
+
         Returns:
             dict: Hierarchical data structure for GUI display
         """
-        participants = self.get_files_by_participant()
-
-        tree_data = {"participants": {}, "summary": self.get_file_summary_stats()}
+        # The participant grouping and the summary share one file listing
+        if files is None:
+            files = self.get_available_files()
+        participants = self.get_files_by_participant(files)
+
+        # Look up which files are analyzed once, instead of per file
+        analyzed_paths = self.db_service.get_cached_paths(
+            [f["file_path"] for records in participants.values() for f in records]
+        )
+
+        tree_data = {
+            "participants": {},
+            "summary": self.get_file_summary_stats(files),
+        }
 
         for participant_id, files in participants.items():
             # Group files by condition for this participant
-            conditions = {}
+            conditions = defaultdict(list)
             for file_record in files:
                 condition = file_record["condition"]
-                if condition not in conditions:
-                    conditions[condition] = []
 
                 # Add GUI-friendly file info
                 file_info = {
@@ -286,17 +332,17 @@ class GUIIntegrationService:
                     "full_path": file_record["file_path"],
                     "condition": condition,
                     "timepoint": file_record["timepoint"],
-                    "is_analyzed": self.is_file_analyzed(file_record["file_path"]),
+                    "is_analyzed": file_record["file_path"] in analyzed_paths,
                     "file_size_mb": round(file_record["file_size"] / (1024 * 1024), 2),
                     "last_modified": file_record["last_modified"],
                 }
                 conditions[condition].append(file_info)
 
             tree_data["participants"][participant_id] = {
-                "conditions": conditions,
+                "conditions": dict(conditions),
                 "total_files": len(files),
                 "analyzed_files": sum(
-                    1 for f in files if self.is_file_analyzed(f["file_path"])
+                    1 for f in files if f["file_path"] in analyzed_paths
                 ),
             }
 
@@ -328,9 +374,10 @@ def populate_gui_from_cache(db_path: str = "granger_cache.db") -> Dict:
         dict: Complete data structure for GUI population
     """
     service = GUIIntegrationService(db_path)
+    files = service.get_available_files()
     return {
-        "file_tree": service.get_gui_file_tree_data(),
-        "participants": service.get_files_by_participant(),
-        "conditions": service.get_files_by_condition(),
-        "stats": service.get_file_summary_stats(),
+        "file_tree": service.get_gui_file_tree_data(files),
+        "participants": service.get_files_by_participant(files),
+        "conditions": service.get_files_by_condition(files),
+        "stats": service.get_file_summary_stats(files),
     }
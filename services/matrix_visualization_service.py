@@ -10,19 +10,29 @@ import numpy as np
 import pandas as pd
 import traceback
 from visualize_matrix import plot_connectivity_matrix
+from .averaging_service import average_matrices
+from .file_system_service import copy_output_file, write_matrix_csv
+from .parallel_render_service import render_in_parallel
+from .scale_service import off_diagonal_mask, off_diagonal_min_max, value_bounds
 from .data_loader_service import (
     group_analyses_by_participant,
     group_analyses_by_condition,
 )
 
 
-def generate_individual_matrix_visualizations(analyzer, output_dir):
+def generate_individual_matrix_visualizations(
+    analyzer, output_dir, max_workers=None, scale_percentiles=None
+):
     """
     Generate individual matrix visualizations with consistent scaling per participant
 
     Args:
         analyzer: GrangerCausalityAnalyzer instance
         output_dir (str): Output directory path
+        max_workers (int, optional): Maximum number of rendering processes
+        scale_percentiles (tuple, optional): (low, high) percentiles of the
+            participant's values to use as the color scale instead of the full
+            min/max
 
     Returns:
         int: Number of visualizations generated
@@ -32,6 +42,9 @@ def generate_individual_matrix_visualizations(analyzer, output_dir):
     individual_dir = os.path.join(output_dir, "individual")
 
     visualization_count = 0
+    jobs = []
+    copies = []
+    rendered = []
 
     # Group analyses by participant to ensure consistent scaling
     participant_analyses = group_analyses_by_participant(analyzer)
@@ -40,70 +53,97 @@ def generate_individual_matrix_visualizations(analyzer, output_dir):
     for participant_id, analyses in participant_analyses.items():
         print(f"\n  Processing participant {participant_id}...")
 
-        # Calculate min/max values across all conditions for this participant
-        all_matrices = []
-        for analysis_key, analysis in analyses:
-            matrix = analysis["connectivity_matrix"]
-            # Exclude diagonal values (they should be 0 or very close to 0)
-            mask = ~np.eye(matrix.shape[0], dtype=bool)
-            all_matrices.extend(matrix.values[mask].flatten())
+        if scale_percentiles is None:
+            # Calculate global min/max for this participant from each matrix's
+            # own off-diagonal bounds, without masking out the diagonal
+            bounds = [
+                off_diagonal_min_max(analysis["connectivity_matrix"].to_numpy())
+                for analysis_key, analysis in analyses
+            ]
+            global_min = min(value_min for value_min, value_max in bounds)
+            global_max = max(value_max for value_min, value_max in bounds)
+        else:
+            # Gather the values across all conditions for this participant
+            # into one preallocated buffer, sized from the matrix shapes. The
+            # buffer only feeds the color scale, so single precision is plenty
+            # and halves the memory the gather and reduction pass over
+            sizes = [
+                analysis["connectivity_matrix"].shape[0]
+                for analysis_key, analysis in analyses
+            ]
+            values = np.empty(
+                sum(size * (size - 1) for size in sizes), dtype=np.float32
+            )
+            offset = 0
+            for size, (analysis_key, analysis) in zip(sizes, analyses):
+                # Exclude diagonal values (they should be 0 or very close to 0)
+                mask = off_diagonal_mask(size)
+                count = size * (size - 1)
+                np.compress(
+                    mask.ravel(),
+                    analysis["connectivity_matrix"].values.ravel(),
+                    out=values[offset : offset + count],
+                )
+                offset += count
 
-        # Calculate global min/max for this participant
-        global_min = np.min(all_matrices)
-        global_max = np.max(all_matrices)
+            # Calculate the percentile bounds for this participant
+            global_min, global_max = value_bounds(values, scale_percentiles)
 
         print(f"    Scale range: {global_min:.6f} to {global_max:.6f}")
 
-        # Generate visualizations for each condition with consistent scaling
+        # Queue visualizations for each condition with consistent scaling
         for analysis_key, analysis in analyses:
+            # Get metadata
+            condition = analysis["metadata"]["condition"]
+            timepoint = analysis["metadata"]["timepoint"]
+
+            # Create descriptive filename
+            base_filename = f"{participant_id}_{timepoint}_{condition}"
+            title = (
+                f"Granger Causality Matrix: {participant_id} {timepoint} {condition}"
+            )
+            scale = {"vmin": global_min, "vmax": global_max}
+
+            # Individual matrix visualization; a copy with a simpler name goes
+            # in the matrices directory once it is rendered
+            path = os.path.join(individual_dir, f"{base_filename}_matrix.png")
+            jobs.append(((analysis["connectivity_matrix"], title, path), scale))
+            copies.append((path, os.path.join(matrices_dir, f"{base_filename}.png")))
+            rendered.append((analysis_key, base_filename))
+
+    errors = render_in_parallel(
+        plot_connectivity_matrix, jobs, max_workers, return_exceptions=True
+    )
+
+    for (analysis_key, base_filename), (path, copy_path), error in zip(
+        rendered, copies, errors
+    ):
+        if error is None:
             try:
-                # Get metadata
-                condition = analysis["metadata"]["condition"]
-                timepoint = analysis["metadata"]["timepoint"]
-
-                # Create descriptive filename
-                base_filename = f"{participant_id}_{timepoint}_{condition}"
-                title = f"Granger Causality Matrix: {participant_id} {timepoint} {condition}"
-
-                # Generate individual matrix visualization with consistent scaling
-                matrix_path = os.path.join(
-                    individual_dir, f"{base_filename}_matrix.png"
-                )
-                plot_connectivity_matrix(
-                    analysis["connectivity_matrix"],
-                    title,
-                    matrix_path,
-                    vmin=global_min,
-                    vmax=global_max,
-                )
-
-                # Also save a copy in the matrices directory with a simpler name
-                simple_matrix_path = os.path.join(matrices_dir, f"{base_filename}.png")
-                plot_connectivity_matrix(
-                    analysis["connectivity_matrix"],
-                    title,
-                    simple_matrix_path,
-                    vmin=global_min,
-                    vmax=global_max,
-                )
-
-                visualization_count += 1
-                print(f"    ✓ Generated matrix for: {base_filename}")
-
-            except Exception as e:
-                print(f"    ✗ Failed to generate matrix for {analysis_key}: {str(e)}")
-                traceback.print_exc()
+                copy_output_file(path, copy_path)
+            except OSError as e:
+                error = e
+        if error is None:
+            visualization_count += 1
+            print(f"    ✓ Generated matrix for: {base_filename}")
+        else:
+            print(f"    ✗ Failed to generate matrix for {analysis_key}: {str(error)}")
+            traceback.print_exception(type(error), error, error.__traceback__)
 
     return visualization_count
 
 
-def generate_condition_level_matrix_visualizations(analyzer, output_dir):
+def generate_condition_level_matrix_visualizations(
+    analyzer, output_dir, scale_percentiles=None
+):
     """
     Generate condition-level matrix visualizations by averaging matrices across all participants
 
     Args:
         analyzer: GrangerCausalityAnalyzer instance
         output_dir (str): Output directory path
+        scale_percentiles (tuple, optional): (low, high) percentiles of the
+            averaged values to use as the color scale instead of the full min/max
     """
     print(f"\nGenerating condition-level matrix visualizations...")
     by_condition_dir = os.path.join(output_dir, "by_condition")
@@ -119,26 +159,23 @@ def generate_condition_level_matrix_visualizations(analyzer, output_dir):
         # First pass: Calculate averaged matrices for all conditions
         condition_matrices = {}
         all_condition_values = []  # To calculate global scale
+        condition_bounds = []
 
         for condition, analyses in condition_analyses.items():
             print(f"\n  Processing condition: {condition}")
             print(f"    Combining {len(analyses)} participants...")
 
             # Get all matrices for this condition
-            matrices = []
-            electrode_sets = []
-
-            for analysis_key, analysis in analyses:
-                matrix = analysis["connectivity_matrix"]
-                matrices.append(matrix)
-                electrode_sets.append(set(matrix.index))
+            matrices = [analysis["connectivity_matrix"] for _, analysis in analyses]
 
-            # Find common electrodes across all participants
-            common_electrodes = electrode_sets[0]
-            for electrode_set in electrode_sets[1:]:
-                common_electrodes = common_electrodes.intersection(electrode_set)
+            # Find common electrodes across all participants with pandas'
+            # hash-based Index.intersection, sorting once at the end
+            common_index = matrices[0].index.unique()
+            for matrix in matrices[1:]:
+                common_index = common_index.intersection(matrix.index)
 
-            common_electrodes = sorted(list(common_electrodes))
+            common_index = common_index.sort_values()
+            common_electrodes = common_index.tolist()
             print(
                 f"    Common electrodes ({len(common_electrodes)}): {', '.join(common_electrodes[:5])}{'...' if len(common_electrodes) > 5 else ''}"
             )
@@ -148,15 +185,7 @@ def generate_condition_level_matrix_visualizations(analyzer, output_dir):
                 continue
 
             # Create averaged matrix
-            averaged_values = np.zeros((len(common_electrodes), len(common_electrodes)))
-
-            for matrix in matrices:
-                # Extract only common electrodes and add to average
-                common_matrix = matrix.loc[common_electrodes, common_electrodes]
-                averaged_values += common_matrix.values
-
-            # Divide by number of participants to get average
-            averaged_values /= len(matrices)
+            averaged_values = average_matrices(matrices, common_index)
 
             # Create averaged DataFrame
             averaged_matrix = pd.DataFrame(
@@ -166,23 +195,33 @@ def generate_condition_level_matrix_visualizations(analyzer, output_dir):
             # Store the averaged matrix for this condition
             condition_matrices[condition] = averaged_matrix
 
-            # Add values to global scale calculation (excluding diagonal)
-            mask = ~np.eye(len(common_electrodes), dtype=bool)
-            all_condition_values.extend(averaged_values[mask].flatten())
+            # Add values to global scale calculation (excluding diagonal); the
+            # full min/max only needs each averaged matrix's own bounds
+            if len(common_electrodes) > 1:
+                if scale_percentiles is None:
+                    condition_bounds.append(off_diagonal_min_max(averaged_values))
+                else:
+                    mask = off_diagonal_mask(len(common_electrodes))
+                    all_condition_values.append(averaged_values[mask])
 
             print(f"    ✓ Averaged matrix calculated for {condition}")
 
         # Calculate global scale across all conditions
-        if all_condition_values:
-            global_min = np.min(all_condition_values)
-            global_max = np.max(all_condition_values)
-            print(
-                f"\n  Global scale for all conditions: {global_min:.6f} to {global_max:.6f}"
-            )
-        else:
+        if not (condition_bounds or all_condition_values):
             print(f"\n  ✗ No data available for global scale calculation")
             return
 
+        if condition_bounds:
+            global_min = min(value_min for value_min, value_max in condition_bounds)
+            global_max = max(value_max for value_min, value_max in condition_bounds)
+        else:
+            global_min, global_max = value_bounds(
+                np.concatenate(all_condition_values), scale_percentiles
+            )
+        print(
+            f"\n  Global scale for all conditions: {global_min:.6f} to {global_max:.6f}"
+        )
+
         # Second pass: Generate visualizations with consistent global scale
         for condition, averaged_matrix in condition_matrices.items():
             print(f"\n  Generating visualization for condition: {condition}")
@@ -205,7 +244,9 @@ def generate_condition_level_matrix_visualizations(analyzer, output_dir):
 
             # Also save the averaged matrix data as CSV for further analysis
             csv_path = os.path.join(by_condition_dir, f"average_{condition}_matrix.csv")
-            averaged_matrix.to_csv(csv_path)
+            write_matrix_csv(
+                averaged_matrix.to_numpy(), averaged_matrix.index.tolist(), csv_path
+            )
             print(f"    ✓ Saved matrix data: average_{condition}_matrix.csv")
 
         print(f"\n  ✓ Condition-level visualizations completed with consistent scaling")
@@ -10,13 +10,38 @@ import numpy as np
 import pandas as pd
 import traceback
 import networkx as nx
-from visualize_network import plot_network_graph
+from visualize_network import plot_network_edges
+from .averaging_service import average_matrices
+from .file_system_service import copy_output_file, write_matrix_csv
+from .parallel_render_service import render_in_parallel
+from .scale_service import value_bounds
 from .data_loader_service import (
     group_analyses_by_participant,
     group_analyses_by_condition,
 )
 
 
+def network_edges_from_matrix(matrix, threshold=0.0005):
+    """
+    Find the edges of the network graph of a connectivity matrix
+
+    Args:
+        matrix (pandas.DataFrame): Connectivity matrix
+        threshold (float): Minimum edge weight to include in graph
+
+    Returns:
+        tuple: (nodes, sources, targets, weights), the electrodes and one array
+            entry per edge, in row-major order
+    """
+    # Edges are the off-diagonal weights above threshold (no self-connections),
+    # found in one vectorized pass
+    sources = matrix.index.to_numpy()
+    targets = matrix.columns.to_numpy()
+    values = matrix.to_numpy()
+    rows, cols = np.nonzero((values > threshold) & (sources[:, None] != targets))
+    return sources, sources[rows], targets[cols], values[rows, cols]
+
+
 def create_network_graph_from_matrix(matrix, threshold=0.0005):
     """
     Create a NetworkX graph from a connectivity matrix
@@ -28,29 +53,32 @@ def create_network_graph_from_matrix(matrix, threshold=0.0005):
     Returns:
         networkx.DiGraph: Directed graph representing connectivity
     """
+    nodes, sources, targets, weights = network_edges_from_matrix(matrix, threshold)
+
     G = nx.DiGraph()
 
     # Add all nodes (electrodes)
-    G.add_nodes_from(matrix.index)
+    G.add_nodes_from(nodes)
 
     # Add edges with weights above threshold
-    for source in matrix.index:
-        for target in matrix.columns:
-            if source != target:  # Skip diagonal (self-connections)
-                weight = matrix.loc[source, target]
-                if weight > threshold:
-                    G.add_edge(source, target, weight=weight)
+    G.add_weighted_edges_from(zip(sources, targets, weights))
 
     return G
 
 
-def generate_individual_network_visualizations(analyzer, output_dir):
+def generate_individual_network_visualizations(
+    analyzer, output_dir, max_workers=None, scale_percentiles=None
+):
     """
     Generate individual network visualizations with consistent scaling per participant
 
     Args:
         analyzer: GrangerCausalityAnalyzer instance
         output_dir (str): Output directory path
+        max_workers (int, optional): Maximum number of rendering processes
+        scale_percentiles (tuple, optional): (low, high) percentiles of the
+            participant's edge weights to use as the color scale instead of
+            the full min/max
 
     Returns:
         int: Number of visualizations generated
@@ -60,6 +88,9 @@ def generate_individual_network_visualizations(analyzer, output_dir):
     individual_dir = os.path.join(output_dir, "individual")
 
     visualization_count = 0
+    jobs = []
+    copies = []
+    rendered = []
 
     # Group analyses by participant to ensure consistent scaling
     participant_analyses = group_analyses_by_participant(analyzer)
@@ -68,21 +99,17 @@ def generate_individual_network_visualizations(analyzer, output_dir):
     for participant_id, analyses in participant_analyses.items():
         print(f"\n  Processing participant {participant_id}...")
 
-        # Calculate min/max edge weights across all conditions for this participant
-        all_edge_weights = []
-        for analysis_key, analysis in analyses:
-            matrix = analysis["connectivity_matrix"]
-            # Get all non-diagonal values as potential edge weights
-            mask = ~np.eye(matrix.shape[0], dtype=bool)
-            matrix_values = matrix.values[mask]
-            # Only include values above threshold as actual edges
-            edge_values = matrix_values[matrix_values > 0.0005]
-            all_edge_weights.extend(edge_values)
+        # Find the network edges of every condition once; their weights give
+        # the scale and the edges are drawn as they are
+        analysis_edges = [
+            network_edges_from_matrix(analysis["connectivity_matrix"])
+            for analysis_key, analysis in analyses
+        ]
+        edge_weights = np.concatenate([edges[3] for edges in analysis_edges])
 
         # Calculate global min/max for edge weights for this participant
-        if all_edge_weights:
-            global_min = np.min(all_edge_weights)
-            global_max = np.max(all_edge_weights)
+        if edge_weights.size:
+            global_min, global_max = value_bounds(edge_weights, scale_percentiles)
             print(f"    Edge weight range: {global_min:.6f} to {global_max:.6f}")
         else:
             global_min = 0
@@ -91,51 +118,60 @@ def generate_individual_network_visualizations(analyzer, output_dir):
                 f"    No edges above threshold, using default range: {global_min:.6f} to {global_max:.6f}"
             )
 
-        # Generate network visualizations for each condition with consistent scaling
-        for analysis_key, analysis in analyses:
+        # Queue network visualizations for each condition with consistent scaling
+        for (analysis_key, analysis), edges in zip(analyses, analysis_edges):
+            # Get metadata
+            condition = analysis["metadata"]["condition"]
+            timepoint = analysis["metadata"]["timepoint"]
+
+            # Create descriptive filename
+            base_filename = f"{participant_id}_{timepoint}_{condition}"
+            title = (
+                f"Granger Causality Network: {participant_id} {timepoint} {condition}"
+            )
+            scale = {"vmin": global_min, "vmax": global_max}
+
+            # Individual network visualization; a copy with a simpler name goes
+            # in the networks directory once it is rendered
+            path = os.path.join(individual_dir, f"{base_filename}_network.png")
+            jobs.append(((*edges, title, path), scale))
+            copies.append((path, os.path.join(networks_dir, f"{base_filename}.png")))
+            rendered.append((analysis_key, base_filename))
+
+    errors = render_in_parallel(
+        plot_network_edges, jobs, max_workers, return_exceptions=True
+    )
+
+    for (analysis_key, base_filename), (path, copy_path), error in zip(
+        rendered, copies, errors
+    ):
+        if error is None:
             try:
-                # Get metadata
-                condition = analysis["metadata"]["condition"]
-                timepoint = analysis["metadata"]["timepoint"]
-
-                # Create descriptive filename
-                base_filename = f"{participant_id}_{timepoint}_{condition}"
-                title = f"Granger Causality Network: {participant_id} {timepoint} {condition}"
-
-                # Create network graph from connectivity matrix
-                G = create_network_graph_from_matrix(analysis["connectivity_matrix"])
-
-                # Generate individual network visualization
-                network_path = os.path.join(
-                    individual_dir, f"{base_filename}_network.png"
-                )
-                plot_network_graph(
-                    G, title, network_path, vmin=global_min, vmax=global_max
-                )
-
-                # Also save a copy in the networks directory with a simpler name
-                simple_network_path = os.path.join(networks_dir, f"{base_filename}.png")
-                plot_network_graph(
-                    G, title, simple_network_path, vmin=global_min, vmax=global_max
-                )
-
-                visualization_count += 1
-                print(f"    ✓ Generated network for: {base_filename}")
-
-            except Exception as e:
-                print(f"    ✗ Failed to generate network for {analysis_key}: {str(e)}")
-                traceback.print_exc()
+                copy_output_file(path, copy_path)
+            except OSError as e:
+                error = e
+        if error is None:
+            visualization_count += 1
+            print(f"    ✓ Generated network for: {base_filename}")
+        else:
+            print(f"    ✗ Failed to generate network for {analysis_key}: {str(error)}")
+            traceback.print_exception(type(error), error, error.__traceback__)
 
     return visualization_count
 
 
-def generate_condition_level_network_visualizations(analyzer, output_dir):
+def generate_condition_level_network_visualizations(
+    analyzer, output_dir, scale_percentiles=None
+):
     """
     Generate condition-level network visualizations by averaging matrices across all participants
 
     Args:
         analyzer: GrangerCausalityAnalyzer instance
         output_dir (str): Output directory path
+        scale_percentiles (tuple, optional): (low, high) percentiles of the
+            averaged edge weights to use as the color scale instead of the
+            full min/max
     """
     print(f"\nGenerating condition-level network visualizations...")
     by_condition_dir = os.path.join(output_dir, "by_condition")
@@ -150,27 +186,23 @@ def generate_condition_level_network_visualizations(analyzer, output_dir):
 
         # First pass: Calculate averaged matrices for all conditions
         condition_matrices = {}
-        all_condition_edge_weights = []  # To calculate global scale
+        condition_edges = {}
 
         for condition, analyses in condition_analyses.items():
             print(f"\n  Processing condition: {condition}")
             print(f"    Combining {len(analyses)} participants...")
 
             # Get all matrices for this condition
-            matrices = []
-            electrode_sets = []
-
-            for analysis_key, analysis in analyses:
-                matrix = analysis["connectivity_matrix"]
-                matrices.append(matrix)
-                electrode_sets.append(set(matrix.index))
+            matrices = [analysis["connectivity_matrix"] for _, analysis in analyses]
 
-            # Find common electrodes across all participants
-            common_electrodes = electrode_sets[0]
-            for electrode_set in electrode_sets[1:]:
-                common_electrodes = common_electrodes.intersection(electrode_set)
+            # Find common electrodes across all participants with pandas'
+            # hash-based Index.intersection, sorting once at the end
+            common_index = matrices[0].index.unique()
+            for matrix in matrices[1:]:
+                common_index = common_index.intersection(matrix.index)
 
-            common_electrodes = sorted(list(common_electrodes))
+            common_index = common_index.sort_values()
+            common_electrodes = common_index.tolist()
             print(
                 f"    Common electrodes ({len(common_electrodes)}): {', '.join(common_electrodes[:5])}{'...' if len(common_electrodes) > 5 else ''}"
             )
@@ -180,15 +212,7 @@ def generate_condition_level_network_visualizations(analyzer, output_dir):
                 continue
 
             # Create averaged matrix
-            averaged_values = np.zeros((len(common_electrodes), len(common_electrodes)))
-
-            for matrix in matrices:
-                # Extract only common electrodes and add to average
-                common_matrix = matrix.loc[common_electrodes, common_electrodes]
-                averaged_values += common_matrix.values
-
-            # Divide by number of participants to get average
-            averaged_values /= len(matrices)
+            averaged_values = average_matrices(matrices, common_index)
 
             # Create averaged DataFrame
             averaged_matrix = pd.DataFrame(
@@ -198,18 +222,18 @@ def generate_condition_level_network_visualizations(analyzer, output_dir):
             # Store the averaged matrix for this condition
             condition_matrices[condition] = averaged_matrix
 
-            # Add edge weights to global scale calculation (excluding diagonal, above threshold)
-            mask = ~np.eye(len(common_electrodes), dtype=bool)
-            matrix_values = averaged_values[mask]
-            edge_values = matrix_values[matrix_values > 0.0005]
-            all_condition_edge_weights.extend(edge_values)
+            # Find the network edges of the averaged matrix; their weights go
+            # into the global scale calculation
+            condition_edges[condition] = network_edges_from_matrix(averaged_matrix)
 
             print(f"    ✓ Averaged matrix calculated for {condition}")
 
         # Calculate global scale across all conditions for edge weights
-        if all_condition_edge_weights:
-            global_min = np.min(all_condition_edge_weights)
-            global_max = np.max(all_condition_edge_weights)
+        edge_weights = np.concatenate(
+            [edges[3] for edges in condition_edges.values()] or [[]]
+        )
+        if edge_weights.size:
+            global_min, global_max = value_bounds(edge_weights, scale_percentiles)
             print(
                 f"\n  Global edge weight scale for all conditions: {global_min:.6f} to {global_max:.6f}"
             )
@@ -229,14 +253,15 @@ def generate_condition_level_network_visualizations(analyzer, output_dir):
             subtitle = f"(n={len(condition_analyses[condition])} participants)"
             full_title = f"{title}\n{subtitle}"
 
-            # Create network graph from averaged connectivity matrix
-            G_avg = create_network_graph_from_matrix(averaged_matrix)
-
             output_path = os.path.join(
                 by_condition_dir, f"average_{condition}_network.png"
             )
-            plot_network_graph(
-                G_avg, full_title, output_path, vmin=global_min, vmax=global_max
+            plot_network_edges(
+                *condition_edges[condition],
+                full_title,
+                output_path,
+                vmin=global_min,
+                vmax=global_max,
             )
 
             print(f"    ✓ Generated average network: average_{condition}_network.png")
@@ -245,7 +270,9 @@ def generate_condition_level_network_visualizations(analyzer, output_dir):
             csv_path = os.path.join(
                 by_condition_dir, f"average_{condition}_network_matrix.csv"
             )
-            averaged_matrix.to_csv(csv_path)
+            write_matrix_csv(
+                averaged_matrix.to_numpy(), averaged_matrix.index.tolist(), csv_path
+            )
             print(
                 f"    ✓ Saved network matrix data: average_{condition}_network_matrix.csv"
             )
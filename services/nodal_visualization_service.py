@@ -9,6 +9,35 @@ with consistent scaling to prevent visual distortions.
 import os
 import numpy as np
 from visualize_nodal import plot_nodal_metrics
+from .parallel_render_service import render_in_parallel
+from .scale_service import padded_scale
+
+# Nodal metrics that get their own scale, in array row order
+SCALE_METRICS = ("in_strength", "out_strength", "causal_flow")
+
+
+def _nodal_metric_arrays(nodal_dicts):
+    """Collect nodal metric values into one float64 array per metric
+
+    Args:
+        nodal_dicts: Iterable of {electrode: metrics} dictionaries
+
+    Returns:
+        Array of shape (len(SCALE_METRICS), number of electrode entries)
+    """
+    rows = [
+        [metrics[name] for name in SCALE_METRICS]
+        for nodal in nodal_dicts
+        for metrics in nodal.values()
+    ]
+    # Transposed into contiguous rows, so each metric is reduced in one sweep
+    values = np.array(rows, dtype=np.float64).reshape(-1, len(SCALE_METRICS))
+    return np.ascontiguousarray(values.T)
+
+
+def _nodal_scales(values):
+    """Return the padded scale of every metric in a _nodal_metric_arrays result"""
+    return {name: padded_scale(row) for name, row in zip(SCALE_METRICS, values)}
 
 
 def calculate_nodal_scales_per_participant(analyses_by_participant):
@@ -27,47 +56,22 @@ def calculate_nodal_scales_per_participant(analyses_by_participant):
             continue
 
         # Collect all nodal metric values for this participant
-        all_in_strength = []
-        all_out_strength = []
-        all_causal_flow = []
-
-        for analysis_key, analysis in analyses:
-            nodal_metrics = analysis["nodal"]
-            for electrode, metrics in nodal_metrics.items():
-                all_in_strength.append(metrics["in_strength"])
-                all_out_strength.append(metrics["out_strength"])
-                all_causal_flow.append(metrics["causal_flow"])
-
-        if all_in_strength:  # Only if we have data
-            # Calculate scales with small padding
-            in_min, in_max = min(all_in_strength), max(all_in_strength)
-            out_min, out_max = min(all_out_strength), max(all_out_strength)
-            flow_min, flow_max = min(all_causal_flow), max(all_causal_flow)
-
-            # Add 5% padding to ranges
-            in_range = in_max - in_min
-            out_range = out_max - out_min
-            flow_range = flow_max - flow_min
-
-            padding_in = in_range * 0.05 if in_range > 0 else 0.0001
-            padding_out = out_range * 0.05 if out_range > 0 else 0.0001
-            padding_flow = flow_range * 0.05 if flow_range > 0 else 0.0001
-
-            participant_scales[participant_id] = {
-                "in_strength": (in_min - padding_in, in_max + padding_in),
-                "out_strength": (out_min - padding_out, out_max + padding_out),
-                "causal_flow": (flow_min - padding_flow, flow_max + padding_flow),
-            }
+        values = _nodal_metric_arrays(analysis["nodal"] for _, analysis in analyses)
+
+        if values.shape[1]:  # Only if we have data
+            # Calculate scales with 5% padding
+            participant_scales[participant_id] = _nodal_scales(values)
 
     return participant_scales
 
 
-def generate_individual_nodal_visualizations(analyzer, output_dir):
+def generate_individual_nodal_visualizations(analyzer, output_dir, max_workers=None):
     """Generate individual nodal visualizations with consistent scaling per participant
 
     Args:
         analyzer: GrangerCausalityAnalyzer instance with loaded analyses
         output_dir: Base output directory
+        max_workers: Maximum number of rendering processes (default: os.cpu_count())
     """
     from .data_loader_service import group_analyses_by_participant
 
@@ -79,6 +83,8 @@ def generate_individual_nodal_visualizations(analyzer, output_dir):
 
     # Generate individual visualizations
     nodals_dir = os.path.join(output_dir, "nodals")
+    jobs = []
+    generated = []
 
     for key, analysis in analyzer.analyses.items():
         participant_id = analysis["metadata"]["participant_id"]
@@ -96,9 +102,13 @@ def generate_individual_nodal_visualizations(analyzer, output_dir):
 
         output_path = os.path.join(nodals_dir, f"{base_name}_nodal.png")
 
-        plot_nodal_metrics(analysis["nodal"], title, output_path, scales=scales)
+        jobs.append(((analysis["nodal"], title, output_path), {"scales": scales}))
+        generated.append(f"{base_name}_nodal.png")
 
-        print(f"  Generated: {base_name}_nodal.png")
+    render_in_parallel(plot_nodal_metrics, jobs, max_workers)
+
+    for filename in generated:
+        print(f"  Generated: {filename}")
 
 
 def generate_condition_level_nodal_visualizations(analyzer, output_dir):
@@ -123,79 +133,47 @@ def generate_condition_level_nodal_visualizations(analyzer, output_dir):
         first_analysis_key, first_analysis = analyses[0]
         electrodes = list(first_analysis["nodal"].keys())
 
-        # Initialize accumulators
-        electrode_metrics = {
-            electrode: {"in_strength": [], "out_strength": [], "causal_flow": []}
-            for electrode in electrodes
-        }
+        # Metric values as (metric, analysis, electrode) arrays; electrodes an
+        # analysis lacks stay zero and are left out of the counts
+        values = np.zeros((len(SCALE_METRICS), len(analyses), len(electrodes)))
+        present = np.zeros((len(analyses), len(electrodes)), dtype=bool)
 
         # Collect metrics from all analyses for this condition
-        for analysis_key, analysis in analyses:
-            for electrode in electrodes:
-                if electrode in analysis["nodal"]:
-                    metrics = analysis["nodal"][electrode]
-                    electrode_metrics[electrode]["in_strength"].append(
-                        metrics["in_strength"]
-                    )
-                    electrode_metrics[electrode]["out_strength"].append(
-                        metrics["out_strength"]
-                    )
-                    electrode_metrics[electrode]["causal_flow"].append(
-                        metrics["causal_flow"]
-                    )
-
-        # Calculate averages
-        averaged_nodal = {}
-        for electrode, metrics in electrode_metrics.items():
-            if metrics["in_strength"]:  # Only if we have data
-                averaged_nodal[electrode] = {
-                    "in_strength": np.mean(metrics["in_strength"]),
-                    "out_strength": np.mean(metrics["out_strength"]),
-                    "causal_flow": np.mean(metrics["causal_flow"]),
-                    "category": (
-                        "sender"
-                        if np.mean(metrics["causal_flow"]) > 0.001
-                        else (
-                            "receiver"
-                            if np.mean(metrics["causal_flow"]) < -0.001
-                            else "neutral"
-                        )
-                    ),
-                }
+        for row, (analysis_key, analysis) in enumerate(analyses):
+            nodal = analysis["nodal"]
+            for column, electrode in enumerate(electrodes):
+                metrics = nodal.get(electrode)
+                if metrics is not None:
+                    present[row, column] = True
+                    values[:, row, column] = [metrics[name] for name in SCALE_METRICS]
+
+        # Calculate averages; every electrode comes from the first analysis, so
+        # each count is at least one
+        in_means, out_means, flow_means = values.sum(axis=1) / present.sum(axis=0)
+        categories = np.where(
+            flow_means > 0.001,
+            "sender",
+            np.where(flow_means < -0.001, "receiver", "neutral"),
+        ).tolist()
+
+        averaged_nodal = {
+            electrode: {
+                "in_strength": in_means[column],
+                "out_strength": out_means[column],
+                "causal_flow": flow_means[column],
+                "category": categories[column],
+            }
+            for column, electrode in enumerate(electrodes)
+        }
 
         condition_averages[condition] = averaged_nodal
 
     # Calculate global scales across all conditions
-    all_in_strength = []
-    all_out_strength = []
-    all_causal_flow = []
-
-    for condition_nodal in condition_averages.values():
-        for electrode, metrics in condition_nodal.items():
-            all_in_strength.append(metrics["in_strength"])
-            all_out_strength.append(metrics["out_strength"])
-            all_causal_flow.append(metrics["causal_flow"])
-
-    if all_in_strength:
-        # Calculate global scales with padding
-        in_min, in_max = min(all_in_strength), max(all_in_strength)
-        out_min, out_max = min(all_out_strength), max(all_out_strength)
-        flow_min, flow_max = min(all_causal_flow), max(all_causal_flow)
-
-        # Add 5% padding
-        in_range = in_max - in_min
-        out_range = out_max - out_min
-        flow_range = flow_max - flow_min
-
-        padding_in = in_range * 0.05 if in_range > 0 else 0.0001
-        padding_out = out_range * 0.05 if out_range > 0 else 0.0001
-        padding_flow = flow_range * 0.05 if flow_range > 0 else 0.0001
-
-        global_scales = {
-            "in_strength": (in_min - padding_in, in_max + padding_in),
-            "out_strength": (out_min - padding_out, out_max + padding_out),
-            "causal_flow": (flow_min - padding_flow, flow_max + padding_flow),
-        }
+    values = _nodal_metric_arrays(condition_averages.values())
+
+    if values.shape[1]:
+        # Calculate global scales with 5% padding
+        global_scales = _nodal_scales(values)
 
         # Generate condition-level visualizations
         by_condition_dir = os.path.join(output_dir, "by_condition")
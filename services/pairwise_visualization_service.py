@@ -9,50 +9,165 @@ with consistent scaling to prevent visual distortions.
 import os
 import numpy as np
 from visualize_pairwise import plot_pairwise_comparison
+from .parallel_render_service import render_in_parallel
+from .scale_service import min_max, pad_bounds, pad_bounds_array
 
 
-def calculate_pairwise_scales_per_participant(analyses_by_participant):
-    """Calculate consistent scales for pairwise metrics per participant
+def _directional_values(pairwise_data):
+    """Return the directional pair GC values as a float64 array"""
+    directional_pairs = pairwise_data["directional_pairs"]
+    return np.fromiter(
+        directional_pairs.values(), dtype=np.float64, count=len(directional_pairs)
+    )
+
+
+def _cached_pairs(analysis_key, analysis, pairs_cache):
+    """Return the directional pair names (tuple) and GC values (float64 array)
+
+    Both are kept in ``pairs_cache`` under the analysis key, together with the
+    dictionary they were read from, so the scale and averaging passes convert
+    each analysis once. A replaced ``directional_pairs`` dictionary is read
+    again. Callers must treat the array as read-only.
+    """
+    directional_pairs = analysis["pairwise"]["directional_pairs"]
+    cached = pairs_cache.get(analysis_key)
+    if cached is not None and cached[0] is directional_pairs:
+        return cached[1], cached[2]
+
+    names = tuple(directional_pairs)
+    values = _directional_values(analysis["pairwise"])
+    values.setflags(write=False)
+    pairs_cache[analysis_key] = (directional_pairs, names, values)
+    return names, values
+
+
+def _analyzer_cache(analyzer, name):
+    """Return the dictionary memoized on the analyzer under ``name``
+
+    The caches live beside ``analyzer.analyses`` rather than in it and are
+    dropped by clear_grouping_cache.
+    """
+    cache = getattr(analyzer, name, None)
+    if cache is None:
+        cache = {}
+        setattr(analyzer, name, cache)
+    return cache
+
+
+def _extremes(arrays):
+    """Return the (min, max) over several arrays, or None if all are empty
+
+    Only the extremes of each array are kept, so the values are never copied
+    into one array.
+    """
+    bounds = [min_max(values) for values in arrays if values.size]
+    if not bounds:
+        return None
+    return (
+        min(value_min for value_min, value_max in bounds),
+        max(value_max for value_min, value_max in bounds),
+    )
+
+
+def _memoize_on_grouping(analyzer, name, grouped, calculate):
+    """Return calculate(grouped), memoized on the analyzer
+
+    The groupings of an analyzer are themselves memoized, and a new grouping
+    object is only built when its analyses change; a result cached for the
+    same grouping object is therefore still current. Callers must treat the
+    returned value as read-only.
+    """
+    cache = _analyzer_cache(analyzer, "_pairwise_cache")
+    cached = cache.get(name)
+    if cached is not None and cached[0] is grouped:
+        return cached[1]
+
+    result = calculate(grouped, _analyzer_cache(analyzer, "_pairs_cache"))
+    cache[name] = (grouped, result)
+    return result
+
+
+def _participant_segments(analyses_by_participant, pairs_cache):
+    """Lay out the pairwise GC values of all participants in one array
+
+    The values are stored participant by participant, so each participant's
+    values form one contiguous segment.
 
     Args:
         analyses_by_participant: Dictionary with participant_id as keys and list of analyses as values
+        pairs_cache: Dictionary the converted pair values are kept in, see _cached_pairs
 
     Returns:
-        Dictionary with participant scales: {participant_id: (min, max)}
+        Tuple of (participant_ids, values, starts): the participants that have
+        any values, a float64 array of their values and an array with the
+        offset of each participant's segment
     """
-    participant_scales = {}
+    participant_ids = []
+    chunks = []
+    starts = []
+    offset = 0
 
     for participant_id, analyses in analyses_by_participant.items():
-        if not analyses:
-            continue
+        arrays = [
+            _cached_pairs(analysis_key, analysis, pairs_cache)[1]
+            for analysis_key, analysis in analyses
+            if "directional_pairs" in analysis["pairwise"]
+        ]
+        count = sum(array.size for array in arrays)
+        if count:  # Only if we have data
+            participant_ids.append(participant_id)
+            starts.append(offset)
+            chunks.extend(arrays)
+            offset += count
+
+    values = np.concatenate(chunks) if chunks else np.empty(0)
+    return participant_ids, values, np.array(starts, dtype=np.intp)
+
+
+def calculate_pairwise_scales_per_participant(
+    analyses_by_participant, pairs_cache=None
+):
+    """Calculate consistent scales for pairwise metrics per participant
 
-        # Collect all pairwise GC values for this participant
-        all_gc_values = []
+    Args:
+        analyses_by_participant: Dictionary with participant_id as keys and list of analyses as values
+        pairs_cache: Optional dictionary to keep the converted pair values in
+            across calls, keyed by analysis key
 
-        for analysis_key, analysis in analyses:
-            pairwise_data = analysis["pairwise"]
-            if "directional_pairs" in pairwise_data:
-                all_gc_values.extend(pairwise_data["directional_pairs"].values())
+    Returns:
+        Dictionary with participant scales: {participant_id: (min, max)}
+    """
+    if pairs_cache is None:
+        pairs_cache = {}
 
-        if all_gc_values:  # Only if we have data
-            # Calculate scales with small padding
-            gc_min, gc_max = min(all_gc_values), max(all_gc_values)
+    participant_ids, values, starts = _participant_segments(
+        analyses_by_participant, pairs_cache
+    )
 
-            # Add 5% padding to range
-            gc_range = gc_max - gc_min
-            padding = gc_range * 0.05 if gc_range > 0 else 0.0001
+    if not participant_ids:
+        return {}
 
-            participant_scales[participant_id] = (gc_min - padding, gc_max + padding)
+    # Find every participant's extremes in one segmented reduction; each
+    # segment is non-empty, as reduceat requires
+    value_mins = np.minimum.reduceat(values, starts)
+    value_maxs = np.maximum.reduceat(values, starts)
 
-    return participant_scales
+    # Add 5% padding to every participant's range at once
+    scale_mins, scale_maxs = pad_bounds_array(value_mins, value_maxs)
+    return dict(zip(participant_ids, zip(scale_mins.tolist(), scale_maxs.tolist())))
 
 
-def generate_individual_pairwise_visualizations(analyzer, output_dir):
+def generate_individual_pairwise_visualizations(
+    analyzer, output_dir, max_workers=None, savefig_kwargs=None
+):
     """Generate individual pairwise visualizations with consistent scaling per participant
 
     Args:
         analyzer: GrangerCausalityAnalyzer instance with loaded analyses
         output_dir: Base output directory
+        max_workers: Maximum number of rendering processes (default: os.cpu_count())
+        savefig_kwargs: Optional keyword arguments for Figure.savefig, e.g.
+            {"pil_kwargs": {"compress_level": 1}} to trade PNG size for speed
     """
     from .data_loader_service import group_analyses_by_participant
 
@@ -60,47 +175,64 @@ def generate_individual_pairwise_visualizations(analyzer, output_dir):
     analyses_by_participant = group_analyses_by_participant(analyzer)
 
     # Calculate scales per participant
-    participant_scales = calculate_pairwise_scales_per_participant(
-        analyses_by_participant
+    participant_scales = _memoize_on_grouping(
+        analyzer,
+        "participant_scales",
+        analyses_by_participant,
+        calculate_pairwise_scales_per_participant,
     )
 
     # Generate individual visualizations
     pairwise_dir = os.path.join(output_dir, "pairwise")
+    jobs = []
+    generated = []
 
-    for key, analysis in analyzer.analyses.items():
-        participant_id = analysis["metadata"]["participant_id"]
-        timepoint = analysis["metadata"]["timepoint"]
-        condition = analysis["metadata"]["condition"]
-
+    # Walk the same participant grouping the scales came from, so each
+    # participant's scale is looked up once for all of its analyses
+    for participant_id, analyses in analyses_by_participant.items():
         # Get scale for this participant
         scale_range = participant_scales.get(participant_id, None)
 
-        base_name = f"{participant_id}_{timepoint}_{condition}"
-        title = f"Pairwise Connections: {participant_id} {timepoint} {condition}"
+        for key, analysis in analyses:
+            timepoint = analysis["metadata"]["timepoint"]
+            condition = analysis["metadata"]["condition"]
 
-        if scale_range:
-            title += f" (Participant {participant_id} Scale)"
+            base_name = f"{participant_id}_{timepoint}_{condition}"
+            title = f"Pairwise Connections: {participant_id} {timepoint} {condition}"
 
-        output_path = os.path.join(pairwise_dir, f"{base_name}_pairwise.png")
+            if scale_range:
+                title += f" (Participant {participant_id} Scale)"
 
-        plot_pairwise_comparison(
-            analysis["pairwise"], title, output_path, scale_range=scale_range
-        )
+            output_path = os.path.join(pairwise_dir, f"{base_name}_pairwise.png")
 
-        print(f"  Generated: {base_name}_pairwise.png")
+            jobs.append(
+                (
+                    (analysis["pairwise"], title, output_path),
+                    {"scale_range": scale_range, "savefig_kwargs": savefig_kwargs},
+                )
+            )
+            generated.append(f"{base_name}_pairwise.png")
 
+    render_in_parallel(plot_pairwise_comparison, jobs, max_workers)
 
-def generate_condition_level_pairwise_visualizations(analyzer, output_dir):
-    """Generate condition-level pairwise visualizations (averaged across participants)
+    for filename in generated:
+        print(f"  Generated: {filename}")
+
+
+def calculate_pairwise_condition_averages(analyses_by_condition, pairs_cache=None):
+    """Average pairwise metrics per condition and calculate their global scale
 
     Args:
-        analyzer: GrangerCausalityAnalyzer instance with loaded analyses
-        output_dir: Base output directory
-    """
-    from .data_loader_service import group_analyses_by_condition
+        analyses_by_condition: Dictionary with condition as keys and list of analyses as values
+        pairs_cache: Optional dictionary to keep the converted pair values in
+            across calls, keyed by analysis key
 
-    # Group analyses by condition
-    analyses_by_condition = group_analyses_by_condition(analyzer)
+    Returns:
+        Tuple of ({condition: averaged pairwise data}, (min, max) global scale),
+        with a None scale if there are no values
+    """
+    if pairs_cache is None:
+        pairs_cache = {}
 
     # Calculate average pairwise metrics per condition
     condition_averages = {}
@@ -113,48 +245,84 @@ def generate_condition_level_pairwise_visualizations(analyzer, output_dir):
         if "directional_pairs" not in first_analysis["pairwise"]:
             continue
 
-        all_pairs = list(first_analysis["pairwise"]["directional_pairs"].keys())
+        all_pairs = _cached_pairs(first_analysis_key, first_analysis, pairs_cache)[0]
 
-        # Initialize accumulators for each pair
-        pair_values = {pair: [] for pair in all_pairs}
+        # Pair values as an (analysis, pair) array; pairs an analysis lacks
+        # stay zero and are left out of the counts
+        values = np.zeros((len(analyses), len(all_pairs)))
+        present = np.zeros(values.shape, dtype=bool)
 
         # Collect values from all analyses for this condition
-        for analysis_key, analysis in analyses:
+        for row, (analysis_key, analysis) in enumerate(analyses):
             pairwise_data = analysis["pairwise"]
             if "directional_pairs" in pairwise_data:
-                for pair, value in pairwise_data["directional_pairs"].items():
-                    if pair in pair_values:
-                        pair_values[pair].append(value)
+                directional_pairs = pairwise_data["directional_pairs"]
+                pair_names, pair_values = _cached_pairs(
+                    analysis_key, analysis, pairs_cache
+                )
+                if pair_names == all_pairs:
+                    # Same pairs in the same order: take the row in one go,
+                    # without a lookup per pair
+                    present[row] = True
+                    values[row] = pair_values
+                    continue
+
+                for column, pair in enumerate(all_pairs):
+                    value = directional_pairs.get(pair)
+                    if value is not None:
+                        present[row, column] = True
+                        values[row, column] = value
+
+        # Calculate averages in one reduction; every pair comes from the first
+        # analysis, so each count is at least one
+        means = values.sum(axis=0) / present.sum(axis=0)
+        averaged_pairwise = {"directional_pairs": dict(zip(all_pairs, means))}
 
-        # Calculate averages
-        averaged_pairwise = {"directional_pairs": {}}
+        condition_averages[condition] = averaged_pairwise
 
-        for pair, values in pair_values.items():
-            if values:  # Only if we have data
-                averaged_pairwise["directional_pairs"][pair] = np.mean(values)
+    # Calculate global scale across all conditions with 5% padding
+    extremes = _extremes(
+        _directional_values(condition_pairwise)
+        for condition_pairwise in condition_averages.values()
+        if "directional_pairs" in condition_pairwise
+    )
+    if extremes is None:
+        return condition_averages, None
 
-        condition_averages[condition] = averaged_pairwise
+    return condition_averages, pad_bounds(*extremes)
 
-    # Calculate global scale across all conditions
-    all_gc_values = []
 
-    for condition_pairwise in condition_averages.values():
-        if "directional_pairs" in condition_pairwise:
-            all_gc_values.extend(condition_pairwise["directional_pairs"].values())
+def generate_condition_level_pairwise_visualizations(
+    analyzer, output_dir, max_workers=None, savefig_kwargs=None
+):
+    """Generate condition-level pairwise visualizations (averaged across participants)
+
+    Args:
+        analyzer: GrangerCausalityAnalyzer instance with loaded analyses
+        output_dir: Base output directory
+        max_workers: Maximum number of rendering processes (default: os.cpu_count())
+        savefig_kwargs: Optional keyword arguments for Figure.savefig, e.g.
+            {"pil_kwargs": {"compress_level": 1}} to trade PNG size for speed
+    """
+    from .data_loader_service import group_analyses_by_condition
 
-    if all_gc_values:
-        # Calculate global scale with padding
-        gc_min, gc_max = min(all_gc_values), max(all_gc_values)
+    # Group analyses by condition
+    analyses_by_condition = group_analyses_by_condition(analyzer)
 
-        # Add 5% padding
-        gc_range = gc_max - gc_min
-        padding = gc_range * 0.05 if gc_range > 0 else 0.0001
+    # Calculate average pairwise metrics per condition and their global scale
+    condition_averages, global_scale = _memoize_on_grouping(
+        analyzer,
+        "condition_averages",
+        analyses_by_condition,
+        calculate_pairwise_condition_averages,
+    )
 
-        global_scale = (gc_min - padding, gc_max + padding)
+    by_condition_dir = os.path.join(output_dir, "by_condition")
+    jobs = []
+    generated = []
 
+    if global_scale is not None:
         # Generate condition-level visualizations
-        by_condition_dir = os.path.join(output_dir, "by_condition")
-
         for condition, averaged_pairwise in condition_averages.items():
             if (
                 "directional_pairs" in averaged_pairwise
@@ -166,10 +334,17 @@ def generate_condition_level_pairwise_visualizations(analyzer, output_dir):
                     by_condition_dir, f"average_{condition}_pairwise.png"
                 )
 
-                plot_pairwise_comparison(
-                    averaged_pairwise, title, output_path, scale_range=global_scale
+                jobs.append(
+                    (
+                        (averaged_pairwise, title, output_path),
+                        {"scale_range": global_scale, "savefig_kwargs": savefig_kwargs},
+                    )
                 )
+                generated.append(f"average_{condition}_pairwise.png")
+
+    render_in_parallel(plot_pairwise_comparison, jobs, max_workers)
 
-                print(f"  Generated: average_{condition}_pairwise.png")
+    for filename in generated:
+        print(f"  Generated: {filename}")
 
     print(f"  Condition-level pairwise visualizations saved to: {by_condition_dir}")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Parallel Render Service
+
+This service runs independent plotting jobs on a process pool. Matplotlib
+rendering is CPU bound and holds the GIL, so figures for different analyses
+are drawn in separate worker processes rather than threads.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _init_worker():
+    """Use the non-interactive Agg backend in worker processes"""
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def render_in_parallel(plot_func, jobs, max_workers=None, return_exceptions=False):
+    """Call plot_func(*args, **kwargs) for every (args, kwargs) pair in jobs
+
+    The jobs must be independent of each other, as they are rendered on a
+    process pool in no particular order. plot_func must be a module-level
+    function and its arguments picklable, since they are sent to worker
+    processes. The jobs are rendered serially when there is only one job or one
+    worker, which avoids the pool's start-up cost.
+
+    Args:
+        plot_func: Plotting function that writes its figure to a file and closes it
+        jobs: Iterable of (args, kwargs) tuples, one per figure
+        max_workers: Maximum number of worker processes (default: os.cpu_count())
+        return_exceptions: Return the exception raised by a failing job instead
+            of raising it, so the remaining figures are still rendered
+
+    Returns:
+        list: One entry per job, None on success or the exception it raised
+    """
+    jobs = list(jobs)
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+
+    if workers <= 1:
+        errors = []
+        for args, kwargs in jobs:
+            try:
+                plot_func(*args, **kwargs)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                errors.append(e)
+            else:
+                errors.append(None)
+        return errors
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = [executor.submit(plot_func, *args, **kwargs) for args, kwargs in jobs]
+        if return_exceptions:
+            return [future.exception() for future in futures]
+        # Wait in order so the first failure propagates here
+        for future in futures:
+            future.result()
+        return [None] * len(futures)
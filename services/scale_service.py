@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Scale Service
+
+This module provides the shared helpers that turn metric values into the
+padded (min, max) scales used for consistent color and axis ranges across
+visualizations.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+
+def min_max(values):
+    """Return (min, max) of a non-empty 1-D array"""
+    return values.min(), values.max()
+
+
+@lru_cache(maxsize=None)
+def off_diagonal_mask(size):
+    """Return a read-only boolean mask selecting the off-diagonal of a square matrix
+
+    Memoized per size, since every matrix of a run usually has the same
+    electrode count.
+    """
+    mask = ~np.eye(size, dtype=bool)
+    mask.setflags(write=False)
+    return mask
+
+
+def off_diagonal_min_max(matrix):
+    """Return (min, max) of the off-diagonal entries of a square matrix
+
+    Connectivity matrices (zero diagonal, no negative weights) are reduced
+    directly: the diagonal cannot raise the max, and only lowers the min to
+    zero when no off-diagonal entry is zero. Anything else is masked.
+
+    Args:
+        matrix: Square 2-D array with at least two rows
+
+    Returns:
+        (min, max) tuple
+    """
+    size = matrix.shape[0]
+    if not np.diagonal(matrix).any():
+        value_min, value_max = matrix.min(), matrix.max()
+        if value_min >= 0:
+            if matrix.size - np.count_nonzero(matrix) == size:
+                value_min = np.min(matrix, where=matrix > 0, initial=np.inf)
+            return value_min, value_max
+
+    off_diagonal = matrix[off_diagonal_mask(size)]
+    return off_diagonal.min(), off_diagonal.max()
+
+
+def value_bounds(values, percentiles=None):
+    """Return the (min, max) color bounds of a non-empty 1-D array
+
+    Args:
+        values: Values the scale has to cover
+        percentiles: Optional (low, high) percentiles to use as the bounds
+            instead of the full min/max, so a few outlying values do not
+            compress the scale for the rest
+
+    Returns:
+        (min, max) tuple
+    """
+    if percentiles is None:
+        return min_max(values)
+    low, high = np.percentile(values, percentiles)
+    return low, high
+
+
+def padded_scale(values):
+    """Return (min, max) of a non-empty array padded by 5% of its range
+
+    A constant array gets a fixed padding of 0.0001 so the scale is not empty.
+    """
+    return pad_bounds(*min_max(values))
+
+
+def pad_bounds(value_min, value_max):
+    """Return (min, max) bounds padded by 5% of their range, as padded_scale"""
+    value_range = value_max - value_min
+    padding = value_range * 0.05 if value_range > 0 else 0.0001
+    return (float(value_min - padding), float(value_max + padding))
+
+
+def pad_bounds_array(value_mins, value_maxs):
+    """Pad many (min, max) bounds at once, as pad_bounds
+
+    The zero-range case is selected with np.where rather than a branch per
+    bound.
+
+    Args:
+        value_mins: 1-D array of lower bounds
+        value_maxs: 1-D array of upper bounds
+
+    Returns:
+        (mins, maxs) tuple of padded float64 arrays
+    """
+    value_ranges = value_maxs - value_mins
+    padding = np.where(value_ranges > 0, value_ranges * 0.05, 0.0001)
+    return value_mins - padding, value_maxs + padding
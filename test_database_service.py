@@ -0,0 +1,127 @@
+import json
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services import database_service
+from services.database_service import DatabaseService, _deserialize_matrix
+
+ELECTRODES = ['Fz', 'Cz', 'Pz', 'Oz']
+
+
+def _matrix():
+    """Return a small connectivity matrix with a zero diagonal"""
+    values = np.arange(16, dtype=np.float64).reshape(4, 4) / 1000
+    np.fill_diagonal(values, 0.0)
+    return pd.DataFrame(values, index=ELECTRODES, columns=ELECTRODES)
+
+
+def _registered_file(tmp_path, db):
+    """Create a data file and register it with the database"""
+    file_path = tmp_path / 'ID101CON1TI1GR1.xlsx'
+    file_path.write_bytes(b'granger')
+    db.register_file(str(file_path), {'participant_id': '101', 'condition': 'CON1',
+                                      'timepoint': 'TI1', 'group': 'GR1'})
+    return str(file_path)
+
+
+@pytest.mark.parametrize('codec', ['zlib', 'zstd'])
+def test_matrix_round_trip(tmp_path, monkeypatch, codec):
+    """A cached matrix is read back unchanged and tagged with its codec"""
+    if codec == 'zstd':
+        monkeypatch.setattr(database_service, 'zstandard', pytest.importorskip('zstandard'))
+    monkeypatch.setattr(database_service, 'MATRIX_CODEC', codec)
+
+    db_path = tmp_path / 'cache.db'
+    db = DatabaseService(str(db_path))
+    file_path = _registered_file(tmp_path, db)
+    db.cache_analysis_result(file_path, 'granger_causality', _matrix(), {'density': 0.5})
+    cached = db.get_cached_analysis(file_path, 'granger_causality')
+    db.close()
+
+    pd.testing.assert_frame_equal(cached['connectivity_matrix'], _matrix())
+    assert cached['electrode_list'] == ELECTRODES
+    assert cached['global_metrics'] == {'density': 0.5}
+
+    with sqlite3.connect(db_path) as conn:
+        stored_codec, = conn.execute('SELECT matrix_codec FROM analysis_results').fetchone()
+    assert stored_codec == codec
+
+
+def test_uncompressed_matrix_round_trip():
+    """A blob stored without a codec is read as raw bytes"""
+    values = _matrix().to_numpy()
+    rebuilt = _deserialize_matrix(values.tobytes(), 4, 4, values.dtype.str,
+                                  json.dumps(ELECTRODES), json.dumps(ELECTRODES), None)
+    pd.testing.assert_frame_equal(rebuilt, _matrix())
+
+
+def _insert_legacy_row(tmp_path, electrode_list):
+    """Cache a matrix as older versions did (JSON text, no blob) and return
+    the database and data file paths"""
+    db_path = tmp_path / 'cache.db'
+    db = DatabaseService(str(db_path))
+    file_path = _registered_file(tmp_path, db)
+    db.close()
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            INSERT INTO analysis_results
+            (file_id, analysis_type, connectivity_matrix, electrode_list)
+            VALUES ((SELECT id FROM files), 'granger_causality', ?, ?)
+            """,
+            (_matrix().to_json(orient='index'), json.dumps(electrode_list)))
+    return db_path, file_path
+
+
+def _stored_matrix_columns(db_path):
+    """Return (matrix_blob is set, connectivity_matrix is set, matrix_codec)"""
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(
+            """
+            SELECT matrix_blob IS NOT NULL, connectivity_matrix IS NOT NULL, matrix_codec
+            FROM analysis_results
+            """).fetchone()
+
+
+def test_legacy_json_row_is_migrated(tmp_path):
+    """Opening the database converts a legacy JSON matrix to a blob"""
+    db_path, file_path = _insert_legacy_row(tmp_path, ELECTRODES)
+
+    db = DatabaseService(str(db_path))
+    cached = db.get_cached_analysis(file_path, 'granger_causality')
+    db.close()
+
+    assert _stored_matrix_columns(db_path) == (1, 0, database_service.MATRIX_CODEC)
+    pd.testing.assert_frame_equal(cached['connectivity_matrix'], _matrix())
+
+
+def test_legacy_row_with_mismatched_electrodes_is_left_alone(tmp_path):
+    """A legacy row whose electrode list does not label its matrix stays JSON"""
+    db_path, file_path = _insert_legacy_row(tmp_path, list(reversed(ELECTRODES)))
+
+    db = DatabaseService(str(db_path))
+    cached = db.get_cached_analysis(file_path, 'granger_causality')
+    db.close()
+
+    assert _stored_matrix_columns(db_path) == (0, 1, None)
+    pd.testing.assert_frame_equal(cached['connectivity_matrix'], _matrix())
+
+
+@pytest.mark.parametrize('has_returning', [True, False])
+def test_register_file_returns_id(tmp_path, monkeypatch, has_returning):
+    """register_file returns the row id with and without UPSERT ... RETURNING"""
+    monkeypatch.setattr(database_service, 'SQLITE_HAS_RETURNING', has_returning)
+
+    db = DatabaseService(str(tmp_path / 'cache.db'))
+    file_path = _registered_file(tmp_path, db)
+    with open(file_path, 'ab') as f:
+        f.write(b' changed')
+    file_id = db.register_file(file_path, {'participant_id': '101'})
+    records = db.get_all_files()
+    db.close()
+
+    assert [(record['id'], record['participant_id']) for record in records] == [(file_id, '101')]
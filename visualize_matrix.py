@@ -1,12 +1,29 @@
-import matplotlib.pyplot as plt
+import threading
+
 import seaborn as sns
 import numpy as np
 import os
+from matplotlib.figure import Figure
+
+# One reusable figure per thread. It is built from matplotlib.figure.Figure
+# rather than pyplot, so it renders through Agg without touching the pyplot
+# backend or figure manager an interactive caller may be using.
+_figures = threading.local()
+
+
+def _matrix_figure():
+    """Return this thread's cleared heatmap figure and a fresh axes on it"""
+    fig = getattr(_figures, "matrix", None)
+    if fig is None:
+        fig = _figures.matrix = Figure(figsize=(10, 8))
+    else:
+        fig.clear()
+    return fig, fig.add_subplot()
 
 
 def plot_connectivity_matrix(gc_matrix, title, output_path, vmin=None, vmax=None):
     """Plot a Granger Causality connectivity matrix as a heatmap"""
-    plt.figure(figsize=(10, 8))
+    fig, ax = _matrix_figure()
 
     # Create a mask for the diagonal
     mask = np.eye(len(gc_matrix))
@@ -22,12 +39,12 @@ def plot_connectivity_matrix(gc_matrix, title, output_path, vmin=None, vmax=None
         linewidths=0.5,
         vmin=vmin,
         vmax=vmax,
+        ax=ax,
     )
 
-    plt.title(f"{title}\nGranger Causality Matrix (Source → Target)", fontsize=14)
-    plt.xlabel("Target Electrode", fontsize=12)
-    plt.ylabel("Source Electrode", fontsize=12)
+    ax.set_title(f"{title}\nGranger Causality Matrix (Source → Target)", fontsize=14)
+    ax.set_xlabel("Target Electrode", fontsize=12)
+    ax.set_ylabel("Source Electrode", fontsize=12)
 
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300)
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=300)
@@ -1,11 +1,16 @@
+from functools import lru_cache
+
 import matplotlib.pyplot as plt
 import networkx as nx
 
 
-def plot_network_graph(G, title, output_path, vmin=None, vmax=None):
-    """Plot a network graph of Granger Causality in a standardized circular layout"""
-    plt.figure(figsize=(14, 10))
+@lru_cache(maxsize=None)
+def _layout_for(nodes):
+    """Return the standardized circular positions of the given nodes
 
+    Memoized per node tuple, since every figure of a run usually has the same
+    electrodes. Nodes outside the standard layout get no position.
+    """
     # Standardized node order for all figures
     standard_nodelist = ["F3", "F4", "C3", "C4", "P3", "P4"]
     # Compute positions for all possible nodes
@@ -17,8 +22,16 @@ def plot_network_graph(G, title, output_path, vmin=None, vmax=None):
         pos["F3"] = pos["C3"]
         pos["C3"] = pos["C4"]
         pos["C4"] = temp
-    # Filter positions to only those present in G
-    pos = {node: pos[node] for node in G.nodes() if node in pos}
+    # Filter positions to only those present in the graph
+    return {node: pos[node] for node in nodes if node in pos}
+
+
+def plot_network_graph(G, title, output_path, vmin=None, vmax=None):
+    """Plot a network graph of Granger Causality in a standardized circular layout"""
+    plt.figure(figsize=(14, 10))
+
+    # Copied, so the memoized layout is never modified
+    pos = dict(_layout_for(tuple(G.nodes())))
 
     # Electrode colors (fallback to gray if not specified)
     electrode_colors = {
@@ -149,3 +162,19 @@ def plot_network_graph(G, title, output_path, vmin=None, vmax=None):
 
     plt.savefig(output_path, dpi=300, bbox_inches="tight")
     plt.close()
+
+
+def plot_network_edges(
+    nodes, sources, targets, weights, title, output_path, vmin=None, vmax=None
+):
+    """Plot a network given as edge arrays, as plot_network_graph does for a graph
+
+    Callers that already hold the thresholded edges (e.g. from np.nonzero on a
+    connectivity matrix) can pass them as parallel sequences, which are cheaper
+    to hand to a worker process than a graph. The directed graph NetworkX
+    needs to draw the arrows is only assembled here.
+    """
+    G = nx.DiGraph()
+    G.add_nodes_from(nodes)
+    G.add_weighted_edges_from(zip(sources, targets, weights))
+    plot_network_graph(G, title, output_path, vmin=vmin, vmax=vmax)
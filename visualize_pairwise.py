@@ -1,10 +1,31 @@
-import matplotlib.pyplot as plt
+import threading
+
 import pandas as pd
 import os
+from matplotlib.artist import setp
+from matplotlib.figure import Figure
+from matplotlib.patches import Rectangle
+
+# One reusable figure per thread for saved plots, built from
+# matplotlib.figure.Figure so it renders through Agg without touching pyplot.
+# pyplot (and with it backend selection) is only imported for plots that are
+# shown, so saving plots in batch or in worker processes never resolves a GUI
+# backend.
+_figures = threading.local()
+
+
+def _pairwise_figure():
+    """Return this thread's cleared bar chart figure and a fresh axes on it"""
+    fig = getattr(_figures, "pairwise", None)
+    if fig is None:
+        fig = _figures.pairwise = Figure(figsize=(14, 10))
+    else:
+        fig.clear()
+    return fig, fig.add_subplot()
 
 
 def plot_pairwise_comparison(
-    pairwise_data, title=None, output_path=None, scale_range=None
+    pairwise_data, title=None, output_path=None, scale_range=None, savefig_kwargs=None
 ):
     """Plot pairwise connection strengths with optional consistent scaling
 
@@ -13,6 +34,8 @@ def plot_pairwise_comparison(
         title: Title for the plot
         output_path: Path to save the plot
         scale_range: Optional tuple (min, max) for consistent y-axis scaling
+        savefig_kwargs: Optional keyword arguments for Figure.savefig, e.g.
+            {"pil_kwargs": {"compress_level": 1}} for faster, larger PNGs
     """
     # Convert to DataFrame for easier plotting
     df = pd.DataFrame(
@@ -38,11 +61,17 @@ def plot_pairwise_comparison(
     # Sort by GC value
     df = df.sort_values("GC Value", ascending=False)
 
-    # Create a figure
-    plt.figure(figsize=(14, 10))
+    # Create a figure; plots that are only shown go through pyplot
+    if output_path:
+        fig, ax = _pairwise_figure()
+    else:
+        import matplotlib.pyplot as plt
+
+        fig = plt.figure(figsize=(14, 10))
+        ax = fig.add_subplot()
 
     # Plot bar chart with each bar colored by source electrode
-    bars = plt.bar(
+    bars = ax.bar(
         df["Pair"],
         df["GC Value"],
         color=[electrode_colors.get(src, "#333333") for src in df["Source"]],
@@ -50,13 +79,13 @@ def plot_pairwise_comparison(
 
     # Apply consistent scaling if provided
     if scale_range is not None:
-        plt.ylim(scale_range)
+        ax.set_ylim(scale_range)
         # Add scale information to the plot
-        plt.text(
+        ax.text(
             0.02,
             0.98,
             f"Scale: {scale_range[0]:.6f} to {scale_range[1]:.6f}",
-            transform=plt.gca().transAxes,
+            transform=ax.transAxes,
             fontsize=8,
             verticalalignment="top",
             bbox=dict(boxstyle="round", facecolor="wheat", alpha=0.8),
@@ -64,25 +93,24 @@ def plot_pairwise_comparison(
 
     # Add labels
     if title:
-        plt.title(title, fontsize=16)
-    plt.xlabel("Connection (Source → Target)", fontsize=14)
-    plt.ylabel("Granger Causality Value", fontsize=14)
-    plt.xticks(rotation=90)
-    plt.grid(axis="y", linestyle="--", alpha=0.7)
+        ax.set_title(title, fontsize=16)
+    ax.set_xlabel("Connection (Source → Target)", fontsize=14)
+    ax.set_ylabel("Granger Causality Value", fontsize=14)
+    setp(ax.get_xticklabels(), rotation=90)
+    ax.grid(axis="y", linestyle="--", alpha=0.7)
 
     # Create a legend for electrode colors
     unique_sources = df["Source"].unique()
     legend_handles = [
-        plt.Rectangle((0, 0), 1, 1, color=electrode_colors.get(src, "#333333"))
+        Rectangle((0, 0), 1, 1, color=electrode_colors.get(src, "#333333"))
         for src in unique_sources
     ]
-    plt.legend(legend_handles, unique_sources, title="Source Electrode")
+    ax.legend(legend_handles, unique_sources, title="Source Electrode")
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     # Save or show the figure
     if output_path:
-        plt.savefig(output_path, dpi=300)
-        plt.close()
+        fig.savefig(output_path, **{"dpi": 300, **(savefig_kwargs or {})})
     else:
         plt.show()